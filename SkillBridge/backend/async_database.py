@@ -0,0 +1,114 @@
+"""
+Async access layer over the SQLite Database for the FastAPI handlers
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from database import Database, db
+
+
+class DatabaseBusyError(Exception):
+    """Raised when too many queries are already waiting for the database"""
+
+
+class _Lane:
+    """Executor plus admission control for one class of queries"""
+
+    def __init__(self, name: str, max_concurrency: int, max_pending: int):
+        self.max_concurrency = max_concurrency
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix=f"db-{name}")
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise DatabaseBusyError(f"{self._pending} queries already waiting for the database")
+            self._pending += 1
+
+        try:
+            await self._slots.acquire()
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+        try:
+            with self._lock:
+                self._running += 1
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+            self._slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_concurrency": self.max_concurrency,
+                "max_pending": self.max_pending,
+                "running": self._running,
+                "pending": self._pending,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+
+class AsyncDatabase:
+    """Runs Database methods on dedicated executors so handlers never block the event loop.
+
+    Reads and writes use separate lanes sized to the read and write
+    connection pools, so queued writes never hold up reads. Within a lane
+    at most ``max_concurrency`` queries run at once and at most
+    ``max_pending`` more may wait for a slot. Anything beyond that is
+    rejected with DatabaseBusyError so callers can shed load instead of
+    piling up behind a slow query.
+    """
+
+    def __init__(self, database: Database, max_pending: int = 64):
+        self.database = database
+        self._reads = _Lane("read", database.read_pool.max_size, max_pending)
+        self._writes = _Lane("write", database.write_pool.max_size, max_pending)
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a blocking callable on the database executor (the write lane if it is marked @writes)"""
+        lane = self._writes if getattr(func, "writes", False) else self._reads
+        return await lane.run(func, *args, **kwargs)
+
+    def __getattr__(self, name: str):
+        # Mirror every public Database method as a coroutine
+        attr = getattr(self.database, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def method(*args, **kwargs):
+            return await self.run(attr, *args, **kwargs)
+
+        return method
+
+    def stats(self) -> Dict[str, Any]:
+        """Executor queue statistics"""
+        return {"read": self._reads.stats(), "write": self._writes.stats()}
+
+    def shutdown(self):
+        self._reads.shutdown()
+        self._writes.shutdown()
+
+
+# Global async database instance
+async_db = AsyncDatabase(db)
@@ -0,0 +1,60 @@
+"""
+Stateless signed access tokens
+
+A token is "<user_id>.<expires>.<signature>": the signature is an
+HMAC-SHA256 of "<user_id>.<expires>" under SECRET_KEY, so verifying a token
+needs no database lookup. Set SKILLBRIDGE_SECRET_KEY to keep tokens valid
+across restarts and between processes; without it every process signs
+with its own random key.
+"""
+
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import time
+from typing import Optional, Tuple
+
+from cache import TTLCache
+
+SECRET_KEY = (os.environ.get("SKILLBRIDGE_SECRET_KEY") or secrets.token_hex(32)).encode()
+TOKEN_TTL = 30 * 24 * 3600
+
+# Verified token -> user, so repeat requests skip the HMAC and the user lookup
+SESSION_CACHE_TTL = 60.0
+session_cache = TTLCache(max_entries=4096, max_bytes=4 * 1024 * 1024, default_ttl=SESSION_CACHE_TTL)
+
+
+def _sign(message: str) -> str:
+    digest = hmac.new(SECRET_KEY, message.encode(), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+
+def create_token(user_id: str, ttl: int = TOKEN_TTL) -> str:
+    """Signed token for ``user_id`` that expires in ``ttl`` seconds"""
+    message = f"{user_id}.{int(time.time()) + ttl}"
+    return f"{message}.{_sign(message)}"
+
+
+def verify_token(token: str) -> Optional[Tuple[str, int]]:
+    """``(user_id, expires_at)`` of a valid, unexpired token, else None"""
+    message, _, signature = token.rpartition(".")
+    user_id, _, expires = message.partition(".")
+    if not user_id or not expires.isdigit():
+        return None
+    if not hmac.compare_digest(signature, _sign(message)):
+        return None
+    if int(expires) <= time.time():
+        return None
+    return user_id, int(expires)
+
+
+def bearer_token(authorization: Optional[str]) -> Optional[str]:
+    """Token from an ``Authorization: Bearer <token>`` header"""
+    if not authorization:
+        return None
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer":
+        return None
+    return token.strip() or None
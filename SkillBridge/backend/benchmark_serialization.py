@@ -0,0 +1,91 @@
+"""
+Benchmark: course list serialization before and after the serialization layer
+
+Before: SELECT *, dict per row with skills decoded, hand-built camelCase dict,
+FastAPI's jsonable_encoder, then json.dumps as JSONResponse renders it.
+After: aliased SELECT into tuples, compiled row encoder, orjson.
+
+Run with: python benchmark_serialization.py [--courses 5000] [--repeat 20]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import uuid
+
+from fastapi.encoders import jsonable_encoder
+
+from database import Database
+from serialization import dumps, orjson
+
+
+def legacy_format_course(course):
+    return {
+        "id": course["id"],
+        "title": course.get("title"),
+        "provider": course.get("provider"),
+        "description": course.get("description", ""),
+        "durationWeeks": course.get("duration_weeks", 0),
+        "price": course.get("price", 0.0),
+        "level": course.get("level", "Beginner"),
+        "skills": course.get("skills", []),
+        "url": course.get("url"),
+        "rating": course.get("rating")
+    }
+
+
+def before(database: Database) -> bytes:
+    with database.read_pool.connection() as conn:
+        courses = database._load_all_courses(conn)
+    content = jsonable_encoder([legacy_format_course(course) for course in courses])
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+
+def after(database: Database) -> bytes:
+    with database.read_pool.connection() as conn:
+        courses, _ = database._load_courses_page(conn, None, None, None, None, True)
+    return dumps(courses)
+
+
+def make_database(count: int) -> Database:
+    database = Database(os.path.join(tempfile.mkdtemp(), "bench.db"))
+    with database.write_pool.connection() as conn:
+        conn.executemany('''
+            INSERT INTO courses (id, title, provider, description, duration_weeks, price, level, skills, url, rating)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [
+            (
+                str(uuid.uuid4()), f"Course {i}", "Provider", "Learn things " * 10, 6, 19.99,
+                "Intermediate", json.dumps(["Swift", "SwiftUI", "iOS"]), f"https://example.com/{i}", 4.5
+            )
+            for i in range(count)
+        ])
+    return database
+
+
+def measure(func, database: Database, repeat: int) -> float:
+    func(database)  # warm up
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func(database)
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--courses", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    database = make_database(args.courses)
+    by_id = lambda course: course["id"]
+    assert sorted(json.loads(before(database)), key=by_id) == sorted(json.loads(after(database)), key=by_id)
+
+    print(f"📊 Serializing {args.courses + 3} courses ({'orjson' if orjson else 'stdlib json'})\n")
+    before_ms = measure(before, database, args.repeat)
+    after_ms = measure(after, database, args.repeat)
+    print(f"   before: {before_ms:8.2f} ms/request")
+    print(f"   after:  {after_ms:8.2f} ms/request")
+    print(f"\n✅ {before_ms / after_ms:.1f}x faster")
@@ -0,0 +1,193 @@
+"""
+In-process LRU + TTL cache for hot database reads
+
+Entries are bounded both by count and by approximate size in bytes, and
+expire after a per-entry TTL. The cache is per process and invalidate()
+only reaches this process's copy: writes made by other workers or by the
+CLI scripts are not seen here. Database therefore stores each entry with
+the entity_versions version it was read at and reloads once that version
+moves (see Database._read_versioned); other callers get no such check
+and see outside writes only after the TTL.
+
+Cached values are shared between callers and must be treated as read-only.
+
+get_or_load() loads outside the lock, so a write can commit and invalidate
+the key while a load that started before it is still reading. Every
+invalidation therefore records a generation number; a load only stores
+its result if neither its key nor a prefix of it was invalidated after
+the load began.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+_MISSING = object()
+
+
+# Long lists are sized from this many evenly spaced items
+SIZE_SAMPLE = 16
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate JSON size of a value in bytes, sampling long lists instead of encoding them"""
+    if isinstance(value, (str, bytes)):
+        return len(value) + 2
+    if value is None or isinstance(value, (bool, int, float)):
+        return 8
+    if isinstance(value, dict):
+        return 2 + sum(estimate_size(key) + estimate_size(item) + 2 for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        count = len(value)
+        if count <= SIZE_SAMPLE:
+            return 2 + sum(estimate_size(item) + 1 for item in value)
+        sample = value[::count // SIZE_SAMPLE][:SIZE_SAMPLE]
+        return 2 + sum(estimate_size(item) + 1 for item in sample) * count // len(sample)
+    return 64
+
+
+class TTLCache:
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 32 * 1024 * 1024, default_ttl: float = 300.0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.stale_loads = 0
+        # Invalidation generations, kept only while loads are in flight
+        self._generation = 0
+        self._loading = 0
+        self._invalidated: Dict[Hashable, int] = {}
+        self._prefixes_invalidated: Dict[Tuple, int] = {}
+        self._cleared = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, expires_at, _ = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None, size: Optional[int] = None):
+        size = estimate_size(value) if size is None else size
+        with self._lock:
+            self._store(key, value, ttl, size)
+
+    def _store(self, key: Hashable, value: Any, ttl: Optional[float], size: int):
+        if size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + (self.default_ttl if ttl is None else ttl)
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (value, expires_at, size)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """Cached value for ``key``, calling ``loader`` on a miss (None results are not cached).
+
+        The result is not stored if ``key`` was invalidated while loading,
+        since it may predate the write that invalidated it.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        with self._lock:
+            started = self._generation
+            self._loading += 1
+        try:
+            value = loader()
+        except BaseException:
+            with self._lock:
+                self._end_load()
+            raise
+        size = estimate_size(value) if value is not None else 0
+        with self._lock:
+            stale = self._invalidated_since(key, started)
+            self._end_load()
+            if stale:
+                self.stale_loads += 1
+            elif value is not None:
+                self._store(key, value, ttl, size)
+        return value
+
+    def _end_load(self):
+        self._loading -= 1
+        if self._loading == 0:
+            # No load can be affected by older invalidations any more
+            self._invalidated.clear()
+            self._prefixes_invalidated.clear()
+
+    def _invalidated_since(self, key: Hashable, generation: int) -> bool:
+        if self._cleared > generation or self._invalidated.get(key, 0) > generation:
+            return True
+        if isinstance(key, tuple):
+            return any(self._prefixes_invalidated.get(key[:length], 0) > generation for length in range(1, len(key) + 1))
+        return False
+
+    def invalidate(self, *keys: Hashable):
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                if self._loading:
+                    self._invalidated[key] = self._generation
+                if key in self._entries:
+                    self._remove(key)
+                    self.invalidations += 1
+
+    def invalidate_prefix(self, prefix: Tuple):
+        """Drop every tuple key that starts with ``prefix``"""
+        with self._lock:
+            self._generation += 1
+            if self._loading:
+                self._prefixes_invalidated[prefix] = self._generation
+            for key in [key for key in self._entries if isinstance(key, tuple) and key[:len(prefix)] == prefix]:
+                self._remove(key)
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._cleared = self._generation
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key: Hashable):
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "stale_loads": self.stale_loads,
+            }
@@ -0,0 +1,229 @@
+"""
+Response compression middleware (brotli and gzip)
+
+Picks an encoding from Accept-Encoding, leaves small or already encoded
+responses alone and compresses streamed responses chunk by chunk.
+Complete responses that carry a strong ETag are cached compressed, keyed
+by a digest of the body and the encoding, so a repeated body is compressed
+once and a changed body can never be answered with old bytes. Bodies and
+chunks of ``offload_size`` bytes or more are compressed on a worker thread
+to keep the event loop free.
+
+Each content-coding is its own representation, so a compressed response
+gets the encoding appended to its ETag ("<tag>-br", "<tag>-gzip"). Handlers
+compare If-None-Match with decoded_etag() and the middleware puts the
+matching suffix back on their 304s.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import zlib
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from cache import TTLCache
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - gzip only
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+ENCODINGS = ("br", "gzip")
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """ETag of the ``encoding`` representation: the encoding joins the opaque tag"""
+    if not etag.endswith('"'):
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def decoded_etag(etag: str) -> str:
+    """ETag of the identity representation behind an encoded_etag()"""
+    for encoding in ENCODINGS:
+        suffix = f'-{encoding}"'
+        if etag.endswith(suffix):
+            return etag[:-len(suffix)] + '"'
+    return etag
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Best supported encoding the client accepts: br, then gzip, else None"""
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.strip().lower()] = quality
+
+    def allowed(encoding: str) -> bool:
+        return accepted.get(encoding, accepted.get("*", 0.0)) > 0
+
+    if brotli is not None and allowed("br"):
+        return "br"
+    if allowed("gzip"):
+        return "gzip"
+    return None
+
+
+class _StreamCompressor:
+    """Incremental compressor that flushes after every chunk so streams stay live"""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+            self._zlib = None
+        else:
+            self._brotli = None
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 5,
+        cache: Optional[TTLCache] = None,
+        offload_size: int = 64 * 1024
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.offload_size = offload_size
+        self.cache = cache or TTLCache(max_entries=256, max_bytes=16 * 1024 * 1024, default_ttl=3600.0)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressingResponder(self, encoding, send, Headers(scope=scope).get("if-none-match", ""))
+        await self.app(scope, receive, responder.send)
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    async def run(self, func: Callable[[bytes], bytes], data: bytes) -> bytes:
+        """``func(data)``, on a worker thread when ``data`` is large enough to stall the event loop"""
+        if len(data) >= self.offload_size:
+            return await asyncio.to_thread(func, data)
+        return func(data)
+
+    def stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
+
+
+class _CompressingResponder:
+    """Wraps ``send`` for one response, deciding on the first body message whether to compress"""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send, if_none_match: str = ""):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.if_none_match = if_none_match
+        self._send = send
+        self._start: Optional[Message] = None
+        self._compressor: Optional[_StreamCompressor] = None
+        self._passthrough = False
+
+    async def send(self, message: Message):
+        if message["type"] == "http.response.start":
+            self._start = message
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            self._passthrough = (
+                message["status"] < 200
+                or message["status"] in (204, 304)
+                or "content-encoding" in headers
+                or not content_type.startswith(COMPRESSIBLE_TYPES)
+            )
+            if self._passthrough:
+                if message["status"] == 304:
+                    self._revalidated(MutableHeaders(raw=message["headers"]))
+                await self._send(message)
+            return
+
+        if message["type"] != "http.response.body" or self._passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self._start is not None:
+            start, self._start = self._start, None
+            headers = MutableHeaders(raw=start["headers"])
+            if not more_body:
+                await self._send_complete(start, headers, body)
+                return
+            self._compressor = _StreamCompressor(self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality)
+            self._set_encoding(headers)
+            del headers["content-length"]
+            await self._send(start)
+
+        chunk = await self.middleware.run(self._compressor.compress, body) if body else b""
+        if not more_body:
+            chunk += self._compressor.finish()
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    async def _send_complete(self, start: Message, headers: MutableHeaders, body: bytes):
+        if len(body) < self.middleware.minimum_size:
+            headers.add_vary_header("Accept-Encoding")
+            await self._send(start)
+            await self._send({"type": "http.response.body", "body": body})
+            return
+
+        etag = headers.get("etag")
+        key: Optional[Tuple[bytes, str]] = None
+        if etag and not etag.startswith("W/"):
+            key = (hashlib.blake2b(body, digest_size=16).digest(), self.encoding)
+        compressed = self.middleware.cache.get(key) if key else None
+        if compressed is None:
+            compressed = await self.middleware.run(lambda data: self.middleware.compress(data, self.encoding), body)
+            if key:
+                self.middleware.cache.set(key, compressed, size=len(compressed))
+
+        self._set_encoding(headers)
+        headers["content-length"] = str(len(compressed))
+        await self._send(start)
+        await self._send({"type": "http.response.body", "body": compressed})
+
+    def _set_encoding(self, headers: MutableHeaders):
+        headers["content-encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        etag = headers.get("etag")
+        if etag:
+            headers["etag"] = encoded_etag(etag, self.encoding)
+
+    def _revalidated(self, headers: MutableHeaders):
+        """A 304 carries the ETag the client validated, including its encoding suffix"""
+        etag = headers.get("etag")
+        if etag and encoded_etag(etag, self.encoding) in self.if_none_match:
+            headers["etag"] = encoded_etag(etag, self.encoding)
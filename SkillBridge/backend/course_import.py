@@ -0,0 +1,225 @@
+"""
+Bulk course import from provider feeds (CSV or NDJSON)
+
+    python course_import.py courses.ndjson [--format csv] [--chunk-size 1000]
+
+Input is parsed one row at a time, each row is validated on its own and
+valid rows are upserted in chunks, one executemany transaction per chunk.
+Rows without an "id" get a stable one derived from provider and url (or
+title), so importing the same feed again updates courses instead of
+duplicating them. POST /api/courses/bulk accepts the same NDJSON rows.
+
+A server running during a CLI import sees the new courses once its catalog
+cache expires; its recommendation index is rebuilt on restart.
+"""
+
+import argparse
+import csv
+import math
+import re
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from database import Database
+from recommendations import LEVELS
+from serialization import loads
+
+DEFAULT_CHUNK_SIZE = 1000
+MAX_CHUNK_SIZE = 10000
+MAX_REPORTED_ERRORS = 100
+# Longer NDJSON lines are skipped as they are read and reported as invalid rows
+MAX_LINE_BYTES = 1024 * 1024
+LINE_TOO_LONG = f"Line is longer than {MAX_LINE_BYTES // (1024 * 1024)} MB"
+
+# iOS field names accepted next to the column names
+FIELD_ALIASES = {"durationWeeks": "duration_weeks"}
+SKILL_SEPARATORS = re.compile(r"[;,|]")
+
+
+def _text(value: Any) -> str:
+    return str(value).strip() if value is not None else ""
+
+
+def _number(row: Dict[str, Any], field: str, kind: Callable, default: Any, maximum: Optional[float] = None) -> Any:
+    value = row.get(field)
+    if value is None or value == "":
+        return default
+    try:
+        number = kind(float(value))
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError(f"{field} must be a number")
+    if not math.isfinite(number):
+        raise ValueError(f"{field} must be a number")
+    if number < 0 or (maximum is not None and number > maximum):
+        raise ValueError(f"{field} must be between 0 and {maximum}" if maximum is not None else f"{field} must not be negative")
+    return number
+
+
+def validate_course(raw: Any) -> Dict[str, Any]:
+    """Course row ready for Database.upsert_courses; raises ValueError on invalid input"""
+    if not isinstance(raw, dict):
+        raise ValueError("Row must be an object")
+    row = {FIELD_ALIASES.get(key, key): value for key, value in raw.items()}
+
+    title = _text(row.get("title"))
+    provider = _text(row.get("provider"))
+    if not title:
+        raise ValueError("title is required")
+    if not provider:
+        raise ValueError("provider is required")
+
+    level = _text(row.get("level")) or "Beginner"
+    canonical_level = next((name for name in LEVELS if name.lower() == level.lower()), None)
+    if canonical_level is None:
+        raise ValueError(f"level must be one of {', '.join(LEVELS)}")
+
+    skills = row.get("skills") or []
+    if isinstance(skills, str):
+        skills = SKILL_SEPARATORS.split(skills)
+    if not isinstance(skills, list):
+        raise ValueError("skills must be a list or a separated string")
+    skills = list(dict.fromkeys(_text(skill) for skill in skills if _text(skill)))
+
+    url = _text(row.get("url")) or None
+    course_id = _text(row.get("id")) or str(uuid.uuid5(uuid.NAMESPACE_URL, f"{provider.lower()}\n{url or title}"))
+
+    return {
+        "id": course_id,
+        "title": title,
+        "provider": provider,
+        "description": _text(row.get("description")),
+        "duration_weeks": _number(row, "duration_weeks", int, 0),
+        "price": _number(row, "price", float, 0.0),
+        "level": canonical_level,
+        "skills": skills,
+        "url": url,
+        "rating": _number(row, "rating", float, None, maximum=5.0)
+    }
+
+
+class BulkImport:
+    """Validates rows into chunks and keeps the counts and per-row errors of one import"""
+
+    def __init__(self, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.chunk_size = max(chunk_size, 1)
+        self.imported = 0
+        self.failed = 0
+        self.errors: List[Dict[str, Any]] = []
+        self._pending: List[Dict[str, Any]] = []
+        self._started = time.perf_counter()
+
+    def add(self, line: int, raw: Any) -> bool:
+        """Validate a row; True once a full chunk is ready to take"""
+        try:
+            self._pending.append(validate_course(raw))
+        except ValueError as exc:
+            self.add_error(line, str(exc))
+        return len(self._pending) >= self.chunk_size
+
+    def add_error(self, line: int, message: str):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "error": message})
+
+    def take_chunk(self) -> List[Dict[str, Any]]:
+        chunk, self._pending = self._pending, []
+        return chunk
+
+    def saved(self, count: int):
+        self.imported += count
+
+    def result(self) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - self._started
+        return {
+            "imported": self.imported,
+            "failed": self.failed,
+            "errors": self.errors,
+            "elapsedSeconds": round(elapsed, 3),
+            "rowsPerSecond": round(self.imported / elapsed, 1) if elapsed > 0 else 0.0
+        }
+
+
+def parse_ndjson_line(line: Union[str, bytes]) -> Any:
+    """Decoded JSON row; raises ValueError with a short message"""
+    try:
+        return loads(line)
+    except ValueError:
+        raise ValueError("Invalid JSON")
+
+
+def read_rows(path: str, file_format: str) -> Iterator[Tuple[int, Any]]:
+    """``(line number, row or ValueError)`` for each non-empty row of a CSV or NDJSON file"""
+    with open(path, newline="", encoding="utf-8-sig") as file:
+        if file_format == "csv":
+            reader = csv.DictReader(file)
+            for row in reader:
+                yield reader.line_num, row
+            return
+        line_number = 0
+        while True:
+            line = file.readline(MAX_LINE_BYTES + 1)
+            if not line:
+                return
+            line_number += 1
+            if len(line) > MAX_LINE_BYTES and not line.endswith("\n"):
+                while line and not line.endswith("\n"):
+                    line = file.readline(MAX_LINE_BYTES + 1)
+                yield line_number, ValueError(LINE_TOO_LONG)
+            elif line.strip():
+                try:
+                    yield line_number, parse_ndjson_line(line)
+                except ValueError as exc:
+                    yield line_number, exc
+
+
+def import_file(
+    database: Database,
+    path: str,
+    file_format: str = "ndjson",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    on_chunk: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    """Import every valid row of a CSV or NDJSON file"""
+    bulk = BulkImport(chunk_size)
+    for line, row in read_rows(path, file_format):
+        if isinstance(row, ValueError):
+            bulk.add_error(line, str(row))
+        elif bulk.add(line, row):
+            bulk.saved(len(database.upsert_courses(bulk.take_chunk())))
+            if on_chunk:
+                on_chunk(bulk.result())
+    chunk = bulk.take_chunk()
+    if chunk:
+        bulk.saved(len(database.upsert_courses(chunk)))
+    return bulk.result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import courses from a CSV or NDJSON file")
+    parser.add_argument("path", help="CSV (with a header row) or NDJSON file")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="Input format (default: from the file extension)")
+    parser.add_argument("--db", default="skillbridge.db", help="SQLite database path")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per transaction")
+    args = parser.parse_args()
+
+    file_format = args.format or ("csv" if args.path.lower().endswith(".csv") else "ndjson")
+    database = Database(args.db)
+
+    def report(progress: Dict[str, Any]):
+        print(f"   {progress['imported']} rows, {progress['rowsPerSecond']} rows/s")
+
+    print(f"📥 Importing courses from {args.path}...")
+    result = import_file(database, args.path, file_format, chunk_size=args.chunk_size, on_chunk=report)
+    for error in result["errors"]:
+        print(f"   ⚠️  line {error['line']}: {error['error']}")
+    if result["failed"] > len(result["errors"]):
+        print(f"   ... and {result['failed'] - len(result['errors'])} more invalid rows")
+    print(
+        f"✅ Done: {result['imported']} courses in {result['elapsedSeconds']}s "
+        f"({result['rowsPerSecond']} rows/s), {result['failed']} invalid rows skipped"
+    )
+
+
+if __name__ == "__main__":
+    main()
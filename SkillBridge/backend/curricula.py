@@ -0,0 +1,155 @@
+"""
+Curriculum upload processing
+
+Uploaded syllabus files are written to UPLOAD_DIR as they stream in, then
+parsed on a small background worker pool. The parser reads the file line
+by line, so memory stays flat however large the syllabus is, and splits
+it into modules at headings such as "# Title", "Module 3: Title",
+"Week 2 - Title" or "1. Title". Text under a heading becomes the module
+description; an hours figure like "(24 hours)" or "Hours: 24" becomes its
+estimate. Skills mentioned in each module are extracted before the
+modules are saved (see skill_extraction.py). The file is deleted once the
+upload is Completed or Failed; until then it stays so resume_pending()
+can pick it up after a restart.
+"""
+
+import os
+import re
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import skill_extraction
+
+UPLOAD_DIR = os.environ.get("SKILLBRIDGE_UPLOAD_DIR", "uploads")
+MAX_UPLOAD_BYTES = 20 * 1024 * 1024
+MAX_MODULE_DESCRIPTION = 4000
+
+HEADING = re.compile(
+    r"^\s*(?:#{1,3}\s+(?P<markdown>.+)"
+    r"|(?:module|unit|week|topic|lecture|chapter)\s*\d+\s*[:.\-–]\s*(?P<named>.+)"
+    r"|\d{1,2}[.)]\s+(?P<numbered>[A-ZА-ЯЁ].{2,}))\s*$",
+    re.IGNORECASE
+)
+HOURS = re.compile(r"(?:\(\s*)?(?:hours?\s*[:=]\s*(\d+)|(\d+)\s*(?:hours?|hrs?|h|ч|час(?:ов|а)?)\b)\s*\)?", re.IGNORECASE)
+
+
+class UnsupportedCurriculumError(Exception):
+    """Raised for files the text parser cannot read (PDF, DOCX, ...)"""
+
+
+def extract_hours(text: str) -> Optional[int]:
+    match = HOURS.search(text)
+    if not match:
+        return None
+    return int(match.group(1) or match.group(2))
+
+
+def parse_modules(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Yield ``{"title", "description", "hoursEstimate", "orderIdx"}`` per module heading"""
+    title: Optional[str] = None
+    description: List[str] = []
+    described = 0
+    hours: Optional[int] = None
+    order = 0
+
+    def module() -> Dict[str, Any]:
+        return {
+            "title": title[:200],
+            "description": " ".join(description),
+            "hoursEstimate": hours or 0,
+            "orderIdx": order
+        }
+
+    for line in lines:
+        text = line.strip()
+        if not text:
+            continue
+        heading = HEADING.match(text)
+        if heading:
+            if title is not None:
+                yield module()
+            order += 1
+            raw_title = heading.group("markdown") or heading.group("named") or heading.group("numbered")
+            hours = extract_hours(raw_title)
+            title = HOURS.sub("", raw_title).strip(" -–:") or raw_title.strip()
+            description, described = [], 0
+            continue
+        if title is None:
+            # Preamble before the first heading is not a module
+            continue
+        if hours is None:
+            hours = extract_hours(text)
+        if described < MAX_MODULE_DESCRIPTION:
+            description.append(text[:MAX_MODULE_DESCRIPTION - described])
+            described += len(text) + 1
+
+    if title is not None:
+        yield module()
+
+
+def parse_curriculum_file(path: str) -> List[Dict[str, Any]]:
+    """Parse an uploaded text or Markdown syllabus into modules"""
+    with open(path, "rb") as file:
+        if b"\x00" in file.read(4096):
+            raise UnsupportedCurriculumError("Binary files (PDF, DOCX) are not supported yet, upload plain text")
+    with open(path, encoding="utf-8", errors="replace") as file:
+        return list(parse_modules(file))
+
+
+class CurriculumProcessor:
+    """Parses uploaded curricula on a bounded worker pool and records the outcome"""
+
+    def __init__(self, database, max_workers: int = 2):
+        self.database = database
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="curricula")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._completed = 0
+        self._failed = 0
+
+    def submit(self, curriculum_id: str, path: str) -> Future:
+        with self._lock:
+            self._queued += 1
+        return self._executor.submit(self._process, curriculum_id, path)
+
+    def resume_pending(self) -> int:
+        """Requeue uploads left Pending or Parsing by a previous run"""
+        pending = self.database.get_unfinished_curricula()
+        for curriculum in pending:
+            self.submit(curriculum["id"], curriculum["file_path"])
+        return len(pending)
+
+    def _process(self, curriculum_id: str, path: str):
+        try:
+            self.database.update_curriculum_status(curriculum_id, "Parsing")
+            modules = parse_curriculum_file(path)
+            if not modules:
+                raise UnsupportedCurriculumError("No modules found; start each module with a heading such as \"Module 1: Title\"")
+            for module in modules:
+                module["id"] = str(uuid.uuid4())
+            matcher = skill_extraction.get_skill_matcher(self.database)
+            # In-thread: forking a process pool from the multithreaded server is unsafe
+            skills = skill_extraction.extract_module_skills(
+                [(module["id"], skill_extraction.module_text(module)) for module in modules], matcher
+            )
+            self.database.save_curriculum_modules(curriculum_id, modules, skills)
+            outcome = "_completed"
+        except Exception as exc:
+            self.database.update_curriculum_status(curriculum_id, "Failed", error=str(exc))
+            outcome = "_failed"
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        with self._lock:
+            self._queued -= 1
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"queued": self._queued, "completed": self._completed, "failed": self._failed}
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
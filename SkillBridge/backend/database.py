@@ -4,185 +4,719 @@ Database setup and models for SkillBridge
 
 import sqlite3
 import json
+import os
+import queue
+import re
+import secrets
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Iterator, Tuple
 import uuid
 
+from cache import TTLCache
+from passwords import hash_password
+from serialization import course_select, encode_rows
+
+DEFAULT_TARGET_ROLE = "iOS Developer"
+
+# Sign-in of the sample user created in an empty database. The password
+# comes from SKILLBRIDGE_SAMPLE_PASSWORD, or is generated and printed once.
+SAMPLE_USER_EMAIL = "student@iitu.kz"
+SAMPLE_PASSWORD_ENV = "SKILLBRIDGE_SAMPLE_PASSWORD"
+
+class VersionConflictError(Exception):
+    """Raised when an optimistic update finds the row at a different version"""
+    
+    def __init__(self, current_version: int):
+        super().__init__(f"Row was modified concurrently (current version {current_version})")
+        self.current_version = current_version
+
+class ConnectionPool:
+    """Bounded pool of SQLite connections shared between threads.
+
+    Connections are created lazily up to ``max_size`` and handed out one
+    caller at a time, so each connection keeps its own prepared statement
+    cache warm across requests instead of re-parsing SQL on every call.
+    """
+
+    def __init__(self, factory: Callable[[], sqlite3.Connection], max_size: int = 5, timeout: float = 30.0):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self._factory = factory
+        self.max_size = max_size
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=max_size)
+        self._lock = threading.Lock()
+        self._created = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+    
+    def acquire(self) -> sqlite3.Connection:
+        """Check out a connection, waiting up to ``timeout`` seconds"""
+        start = time.perf_counter()
+        conn = None
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_create = self._created < self.max_size
+                if can_create:
+                    self._created += 1
+            if can_create:
+                try:
+                    conn = self._factory()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            else:
+                try:
+                    conn = self._idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    raise TimeoutError(f"No database connection available after {self.timeout}s")
+        
+        waited = time.perf_counter() - start
+        with self._lock:
+            self._checkouts += 1
+            if waited > 0.001:
+                self._waits += 1
+            self._wait_time_total += waited
+            self._wait_time_max = max(self._wait_time_max, waited)
+        return conn
+    
+    def release(self, conn: sqlite3.Connection):
+        """Return a connection to the pool"""
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put_nowait(conn)
+    
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection; commits on success, rolls back on error"""
+        conn = self.acquire()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.release(conn)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Pool size and checkout wait-time statistics"""
+        with self._lock:
+            checkouts = self._checkouts
+            return {
+                "max_size": self.max_size,
+                "created": self._created,
+                "idle": self._idle.qsize(),
+                "in_use": self._created - self._idle.qsize(),
+                "checkouts": checkouts,
+                "waits": self._waits,
+                "wait_time_total_ms": round(self._wait_time_total * 1000, 3),
+                "wait_time_avg_ms": round(self._wait_time_total * 1000 / checkouts, 3) if checkouts else 0.0,
+                "wait_time_max_ms": round(self._wait_time_max * 1000, 3),
+            }
+    
+    def close(self):
+        """Close every idle connection"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._created -= 1
+
+def writes(method: Callable) -> Callable:
+    """Mark a Database method as mutating, so async callers route it to the writer"""
+    method.writes = True
+    return method
+
+# Applied to every connection. WAL lets readers run alongside the single
+# writer; synchronous=NORMAL is durable in WAL mode except on power loss.
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -20000",     # 20 MB page cache per connection
+    "PRAGMA mmap_size = 268435456",   # 256 MB memory-mapped reads
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA busy_timeout = 5000",
+)
+
+# Pending changes above which delta sync falls back to a full snapshot
+SYNC_MAX_CHANGES = 1000
+
+# Newest change_log rows kept; clients synced before the oldest kept row get a full snapshot
+CHANGE_LOG_RETENTION = 100000
+
+# Seconds a cached read may be served before going back to SQLite
+CATALOG_CACHE_TTL = 300.0
+REPORT_CACHE_TTL = 60.0
+
 class Database:
-    def __init__(self, db_path: str = "skillbridge.db"):
+    def __init__(self, db_path: str = "skillbridge.db", pool_size: int = 5, cache: Optional[TTLCache] = None):
         self.db_path = db_path
+        # Hot reads (catalog, latest reports and roadmaps); writers invalidate explicitly
+        self.cache = cache or TTLCache()
+        # Reads scale with the pool; every mutation goes through one writer
+        self.read_pool = ConnectionPool(lambda: self.get_connection(readonly=True), max_size=pool_size)
+        self.write_pool = ConnectionPool(self.get_connection, max_size=1)
         self.init_database()
     
-    def get_connection(self):
-        conn = sqlite3.connect(self.db_path)
+    def get_connection(self, readonly: bool = False):
+        # Pooled connections move between worker threads, but only one
+        # thread ever holds a given connection at a time
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=256)
         conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        if readonly:
+            conn.execute("PRAGMA query_only = ON")
         return conn
     
+    def pool_stats(self) -> Dict[str, Any]:
+        """Connection pool statistics"""
+        return {"read": self.read_pool.stats(), "write": self.write_pool.stats()}
+    
     def init_database(self):
         """Initialize database tables"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.write_pool.connection() as conn:
+            # Persistent for the database file, so only the writer sets it
+            conn.execute("PRAGMA journal_mode = WAL")
+            cursor = conn.cursor()
+            
+            # Users table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS users (
+                    id TEXT PRIMARY KEY,
+                    email TEXT UNIQUE NOT NULL,
+                    name TEXT NOT NULL,
+                    role TEXT NOT NULL,
+                    password_hash TEXT,
+                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # Courses table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS courses (
+                    id TEXT PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    provider TEXT NOT NULL,
+                    description TEXT,
+                    duration_weeks INTEGER,
+                    price REAL,
+                    level TEXT,
+                    skills TEXT,  -- JSON array
+                    url TEXT,
+                    rating REAL,
+                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # Gap Reports table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS gap_reports (
+                    id TEXT PRIMARY KEY,
+                    user_id TEXT NOT NULL,
+                    readiness_score REAL,
+                    skill_gaps TEXT,  -- JSON array
+                    generated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (user_id) REFERENCES users(id)
+                )
+            ''')
+            
+            # Roadmaps table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS roadmaps (
+                    id TEXT PRIMARY KEY,
+                    user_id TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    status TEXT,
+                    estimated_total_hours INTEGER,
+                    steps TEXT,  -- legacy JSON array, migrated to roadmap_steps
+                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (user_id) REFERENCES users(id)
+                )
+            ''')
+            
+            # Skills vocabulary and course <-> skill inverted index
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS skills (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL UNIQUE COLLATE NOCASE
+                )
+            ''')
+            
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS course_skills (
+                    skill_id INTEGER NOT NULL,
+                    course_id TEXT NOT NULL,
+                    PRIMARY KEY (skill_id, course_id),
+                    FOREIGN KEY (skill_id) REFERENCES skills(id),
+                    FOREIGN KEY (course_id) REFERENCES courses(id)
+                ) WITHOUT ROWID
+            ''')
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_course_skills_course ON course_skills(course_id)")
+            
+            # Alternative spellings matched as the skill, e.g. "Swift UI" -> SwiftUI
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS skill_aliases (
+                    alias TEXT PRIMARY KEY COLLATE NOCASE,
+                    skill_id INTEGER NOT NULL,
+                    FOREIGN KEY (skill_id) REFERENCES skills(id)
+                ) WITHOUT ROWID
+            ''')
+            
+            # Current skill levels per user (0-100)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS user_skills (
+                    user_id TEXT NOT NULL,
+                    skill_id INTEGER NOT NULL,
+                    level REAL NOT NULL,
+                    PRIMARY KEY (user_id, skill_id),
+                    FOREIGN KEY (user_id) REFERENCES users(id),
+                    FOREIGN KEY (skill_id) REFERENCES skills(id)
+                ) WITHOUT ROWID
+            ''')
+            
+            # Required skill levels (0-100) and weights per target role
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS role_skills (
+                    role TEXT NOT NULL,
+                    skill_id INTEGER NOT NULL,
+                    required_level REAL NOT NULL,
+                    weight REAL NOT NULL DEFAULT 1.0,
+                    PRIMARY KEY (role, skill_id),
+                    FOREIGN KEY (skill_id) REFERENCES skills(id)
+                ) WITHOUT ROWID
+            ''')
+            
+            # Roadmap steps, one row per step (replaces the roadmaps.steps JSON column)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS roadmap_steps (
+                    roadmap_id TEXT NOT NULL,
+                    id TEXT NOT NULL,
+                    step_order INTEGER NOT NULL,
+                    title TEXT NOT NULL,
+                    description TEXT,
+                    skill_name TEXT,
+                    course_id TEXT,
+                    est_hours INTEGER,
+                    status TEXT NOT NULL DEFAULT 'Pending',
+                    version INTEGER NOT NULL DEFAULT 1,
+                    updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (roadmap_id, id),
+                    FOREIGN KEY (roadmap_id) REFERENCES roadmaps(id)
+                ) WITHOUT ROWID
+            ''')
+            
+            # Skill prerequisite DAG: skill_id requires prerequisite_id
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS skill_prerequisites (
+                    skill_id INTEGER NOT NULL,
+                    prerequisite_id INTEGER NOT NULL,
+                    PRIMARY KEY (skill_id, prerequisite_id),
+                    FOREIGN KEY (skill_id) REFERENCES skills(id),
+                    FOREIGN KEY (prerequisite_id) REFERENCES skills(id)
+                ) WITHOUT ROWID
+            ''')
+            
+            # Progress of resumable batch jobs
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS job_checkpoints (
+                    name TEXT PRIMARY KEY,
+                    last_key TEXT,
+                    processed INTEGER NOT NULL DEFAULT 0,
+                    started_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    finished_at TEXT
+                )
+            ''')
+            
+            # Change counters behind HTTP ETags: "courses", "gap_report:<user_id>", "roadmap:<user_id>"
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS entity_versions (
+                    key TEXT PRIMARY KEY,
+                    version INTEGER NOT NULL DEFAULT 1,
+                    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+                ) WITHOUT ROWID
+            ''')
+            
+            # Append-only log of client-visible writes, read by delta sync.
+            # user_id is NULL for shared rows (courses) that every client receives
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS change_log (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    entity TEXT NOT NULL,
+                    entity_id TEXT NOT NULL,
+                    user_id TEXT,
+                    changed_at TEXT DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # Uploaded syllabi: Pending -> Parsing -> Completed | Failed
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS curricula (
+                    id TEXT PRIMARY KEY,
+                    user_id TEXT,
+                    title TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'Pending',
+                    source TEXT NOT NULL DEFAULT 'Upload',
+                    file_path TEXT,
+                    file_size INTEGER DEFAULT 0,
+                    error TEXT,
+                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (user_id) REFERENCES users(id)
+                )
+            ''')
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_curricula_status ON curricula(status)")
+            
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS curriculum_modules (
+                    curriculum_id TEXT NOT NULL,
+                    id TEXT NOT NULL,
+                    order_idx INTEGER NOT NULL,
+                    title TEXT NOT NULL,
+                    description TEXT,
+                    hours_estimate INTEGER DEFAULT 0,
+                    PRIMARY KEY (curriculum_id, id),
+                    FOREIGN KEY (curriculum_id) REFERENCES curricula(id)
+                ) WITHOUT ROWID
+            ''')
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_curriculum_modules_order ON curriculum_modules(curriculum_id, order_idx)")
+            
+            # Skills found in curriculum modules (see skill_extraction.py)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS curriculum_skills (
+                    curriculum_id TEXT NOT NULL,
+                    module_id TEXT NOT NULL,
+                    skill_id INTEGER NOT NULL,
+                    mentions INTEGER NOT NULL DEFAULT 1,
+                    PRIMARY KEY (curriculum_id, module_id, skill_id),
+                    FOREIGN KEY (curriculum_id) REFERENCES curricula(id),
+                    FOREIGN KEY (skill_id) REFERENCES skills(id)
+                ) WITHOUT ROWID
+            ''')
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_curriculum_skills_skill ON curriculum_skills(skill_id, curriculum_id)")
+            
+            # Applied schema migrations
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS schema_migrations (
+                    version INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    applied_at TEXT DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            self.fts_enabled = self._init_course_search(cursor)
         
-        # Users table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                id TEXT PRIMARY KEY,
-                email TEXT UNIQUE NOT NULL,
-                name TEXT NOT NULL,
-                role TEXT NOT NULL,
-                password_hash TEXT,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
+        # Bring existing databases up to the current schema
+        self.apply_migrations()
+        
+        # Initialize sample data
+        self.init_sample_data()
+    
+    @writes
+    def apply_migrations(self) -> List[int]:
+        """Apply pending MIGRATIONS in version order, each in its own transaction"""
+        with self.write_pool.connection() as conn:
+            applied = {row["version"] for row in conn.execute("SELECT version FROM schema_migrations")}
+        
+        newly_applied = []
+        for version, name, migrate in MIGRATIONS:
+            if version in applied:
+                continue
+            with self.write_pool.connection() as conn:
+                migrate(conn)
+                conn.execute("INSERT INTO schema_migrations (version, name) VALUES (?, ?)", (version, name))
+            newly_applied.append(version)
+        return newly_applied
+    
+    def get_entity_version(self, key: str) -> Tuple[int, Optional[str]]:
+        """``(version, updated_at)`` of an entity_versions key; ``(0, None)`` if never written"""
+        with self.read_pool.connection() as conn:
+            row = conn.execute("SELECT version, updated_at FROM entity_versions WHERE key = ?", (key,)).fetchone()
+        return (row["version"], row["updated_at"]) if row else (0, None)
+    
+    def _read_versioned(
+        self,
+        entity_key: str,
+        load: Callable[[sqlite3.Connection], Any],
+        cache_key: Optional[Tuple] = None,
+        ttl: Optional[float] = None
+    ) -> Tuple[Any, int, Optional[str]]:
+        """``(value, version, updated_at)``: ``load(conn)`` read in one snapshot with the entity's version.
+        
+        Cached entries keep the version they were read at and are served
+        only while entity_versions still holds it, so writes made by other
+        processes (a second worker, the CLIs) show up on the next read
+        instead of after the TTL. Callers build ETags from the returned
+        version, which always matches the value.
+        """
+        if cache_key is not None:
+            entry = self.cache.get(cache_key)
+            if entry is not None and entry[1] == self.get_entity_version(entity_key)[0]:
+                return entry
+        
+        with self.read_pool.connection() as conn:
+            conn.execute("BEGIN")
+            row = conn.execute("SELECT version, updated_at FROM entity_versions WHERE key = ?", (entity_key,)).fetchone()
+            value = load(conn)
+        entry = (value, row["version"], row["updated_at"]) if row else (value, 0, None)
+        if cache_key is not None and value is not None:
+            self.cache.set(cache_key, entry, ttl=ttl)
+        return entry
+    
+    @staticmethod
+    def _bump_versions(conn: sqlite3.Connection, keys: List[str]):
+        """Advance entity_versions counters inside the caller's write transaction"""
+        conn.executemany('''
+            INSERT INTO entity_versions (key) VALUES (?)
+            ON CONFLICT(key) DO UPDATE SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+        ''', [(key,) for key in keys])
+    
+    @staticmethod
+    def _log_changes(conn: sqlite3.Connection, entity: str, changes: List[Tuple[str, Optional[str]]]):
+        """Append ``(entity_id, user_id)`` rows to change_log inside the caller's write transaction"""
+        conn.executemany(
+            "INSERT INTO change_log (entity, entity_id, user_id) VALUES (?, ?, ?)",
+            [(entity, entity_id, user_id) for entity_id, user_id in changes]
+        )
+        # Trim below the retention horizon; a rowid range delete, usually of nothing
+        conn.execute("DELETE FROM change_log WHERE seq <= last_insert_rowid() - ?", (CHANGE_LOG_RETENTION,))
+    
+    def get_schema_version(self) -> int:
+        """Highest applied migration version"""
+        with self.read_pool.connection() as conn:
+            row = conn.execute("SELECT MAX(version) FROM schema_migrations").fetchone()
+        return row[0] or 0
+    
+    @staticmethod
+    def _init_course_search(cursor: sqlite3.Cursor) -> bool:
+        """Create the FTS5 course index and its sync triggers; False if FTS5 is unavailable"""
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'courses_fts'")
+        exists = cursor.fetchone() is not None
+        try:
+            # External-content table: the index stores tokens only, rows stay in courses
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS courses_fts USING fts5(
+                    title, description, provider, skills,
+                    content='courses',
+                    content_rowid='rowid',
+                    tokenize='unicode61 remove_diacritics 2',
+                    prefix='2 3'
+                )
+            ''')
+        except sqlite3.OperationalError:
+            return False
         
-        # Courses table
         cursor.execute('''
-            CREATE TABLE IF NOT EXISTS courses (
-                id TEXT PRIMARY KEY,
-                title TEXT NOT NULL,
-                provider TEXT NOT NULL,
-                description TEXT,
-                duration_weeks INTEGER,
-                price REAL,
-                level TEXT,
-                skills TEXT,  -- JSON array
-                url TEXT,
-                rating REAL,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP
-            )
+            CREATE TRIGGER IF NOT EXISTS courses_fts_insert AFTER INSERT ON courses BEGIN
+                INSERT INTO courses_fts (rowid, title, description, provider, skills)
+                VALUES (new.rowid, new.title, new.description, new.provider, new.skills);
+            END
         ''')
-        
-        # Gap Reports table
         cursor.execute('''
-            CREATE TABLE IF NOT EXISTS gap_reports (
-                id TEXT PRIMARY KEY,
-                user_id TEXT NOT NULL,
-                readiness_score REAL,
-                skill_gaps TEXT,  -- JSON array
-                generated_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users(id)
-            )
+            CREATE TRIGGER IF NOT EXISTS courses_fts_delete AFTER DELETE ON courses BEGIN
+                INSERT INTO courses_fts (courses_fts, rowid, title, description, provider, skills)
+                VALUES ('delete', old.rowid, old.title, old.description, old.provider, old.skills);
+            END
         ''')
-        
-        # Roadmaps table
         cursor.execute('''
-            CREATE TABLE IF NOT EXISTS roadmaps (
-                id TEXT PRIMARY KEY,
-                user_id TEXT NOT NULL,
-                title TEXT NOT NULL,
-                status TEXT,
-                estimated_total_hours INTEGER,
-                steps TEXT,  -- JSON array
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users(id)
-            )
+            CREATE TRIGGER IF NOT EXISTS courses_fts_update AFTER UPDATE ON courses BEGIN
+                INSERT INTO courses_fts (courses_fts, rowid, title, description, provider, skills)
+                VALUES ('delete', old.rowid, old.title, old.description, old.provider, old.skills);
+                INSERT INTO courses_fts (rowid, title, description, provider, skills)
+                VALUES (new.rowid, new.title, new.description, new.provider, new.skills);
+            END
         ''')
         
-        conn.commit()
-        conn.close()
-        
-        # Initialize sample data
-        self.init_sample_data()
+        if not exists:
+            # Index courses created before search existed
+            cursor.execute("INSERT INTO courses_fts (courses_fts) VALUES ('rebuild')")
+        return True
+    
+    @staticmethod
+    def _index_course_skills(conn: sqlite3.Connection, course_id: str, skills: List[str]):
+        names = [name.strip() for name in skills if name and name.strip()]
+        if not names:
+            return
+        conn.executemany("INSERT OR IGNORE INTO skills (name) VALUES (?)", [(name,) for name in names])
+        placeholders = ",".join("?" * len(names))
+        conn.execute(f'''
+            INSERT OR IGNORE INTO course_skills (skill_id, course_id)
+            SELECT id, ? FROM skills WHERE name IN ({placeholders})
+        ''', (course_id, *names))
+    
+    @staticmethod
+    def _skill_ids(conn: sqlite3.Connection, names: List[str]) -> Dict[str, int]:
+        """Skill ids by name, creating missing skills"""
+        conn.executemany("INSERT OR IGNORE INTO skills (name) VALUES (?)", [(name,) for name in names])
+        placeholders = ",".join("?" * len(names))
+        rows = conn.execute(f"SELECT id, name FROM skills WHERE name IN ({placeholders})", names).fetchall()
+        ids = {row["name"].lower(): row["id"] for row in rows}
+        return {name: ids[name.lower()] for name in names}
     
     def init_sample_data(self):
         """Initialize sample data if tables are empty"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        # Check if users exist
-        cursor.execute("SELECT COUNT(*) FROM users")
-        if cursor.fetchone()[0] == 0:
-            # Add sample user
-            user_id = str(uuid.uuid4())
-            cursor.execute('''
-                INSERT INTO users (id, email, name, role)
-                VALUES (?, ?, ?, ?)
-            ''', (user_id, "student@iitu.kz", "Nurislam Kenzheyev", "student"))
-            
-            # Add sample courses
-            courses = [
-                {
-                    "id": str(uuid.uuid4()),
-                    "title": "iOS Development with SwiftUI",
-                    "provider": "Apple",
-                    "description": "Learn iOS development using SwiftUI framework",
-                    "duration_weeks": 8,
-                    "price": 0.0,
-                    "level": "Beginner",
-                    "skills": json.dumps(["Swift", "SwiftUI", "iOS"]),
-                    "url": "https://developer.apple.com/swiftui",
-                    "rating": 4.8
-                },
-                {
-                    "id": str(uuid.uuid4()),
-                    "title": "Advanced Swift Programming",
-                    "provider": "Udemy",
-                    "description": "Master advanced Swift concepts",
-                    "duration_weeks": 6,
-                    "price": 49.99,
-                    "level": "Intermediate",
-                    "skills": json.dumps(["Swift", "iOS"]),
-                    "url": "https://udemy.com/swift",
-                    "rating": 4.6
-                },
-                {
-                    "id": str(uuid.uuid4()),
-                    "title": "SwiftUI Masterclass",
-                    "provider": "Coursera",
-                    "description": "Complete SwiftUI course",
-                    "duration_weeks": 10,
-                    "price": 79.99,
-                    "level": "Advanced",
-                    "skills": json.dumps(["SwiftUI", "iOS", "Combine"]),
-                    "url": "https://coursera.org/swiftui",
-                    "rating": 4.9
-                }
-            ]
+        generated_password = None
+        with self.write_pool.connection() as conn:
+            cursor = conn.cursor()
             
-            for course in courses:
+            # Check if users exist
+            cursor.execute("SELECT COUNT(*) FROM users")
+            if cursor.fetchone()[0] == 0:
+                # Add sample user
+                password = os.environ.get(SAMPLE_PASSWORD_ENV)
+                if not password:
+                    password = generated_password = secrets.token_urlsafe(12)
+                user_id = str(uuid.uuid4())
                 cursor.execute('''
-                    INSERT INTO courses (id, title, provider, description, duration_weeks, price, level, skills, url, rating)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    INSERT INTO users (id, email, name, role, target_role, password_hash, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
                 ''', (
-                    course["id"],
-                    course["title"],
-                    course["provider"],
-                    course["description"],
-                    course["duration_weeks"],
-                    course["price"],
-                    course["level"],
-                    course["skills"],
-                    course["url"],
-                    course["rating"]
+                    user_id, SAMPLE_USER_EMAIL, "Nurislam Kenzheyev", "student", DEFAULT_TARGET_ROLE,
+                    hash_password(password)
                 ))
+                self._upsert_user_skill_levels(conn, user_id, {
+                    "Swift": 60.0,
+                    "SwiftUI": 40.0,
+                    "Combine": 20.0,
+                    "iOS": 50.0,
+                    "Git": 70.0
+                })
+                
+                # Add sample courses
+                courses = [
+                    {
+                        "id": str(uuid.uuid4()),
+                        "title": "iOS Development with SwiftUI",
+                        "provider": "Apple",
+                        "description": "Learn iOS development using SwiftUI framework",
+                        "duration_weeks": 8,
+                        "price": 0.0,
+                        "level": "Beginner",
+                        "skills": json.dumps(["Swift", "SwiftUI", "iOS"]),
+                        "url": "https://developer.apple.com/swiftui",
+                        "rating": 4.8
+                    },
+                    {
+                        "id": str(uuid.uuid4()),
+                        "title": "Advanced Swift Programming",
+                        "provider": "Udemy",
+                        "description": "Master advanced Swift concepts",
+                        "duration_weeks": 6,
+                        "price": 49.99,
+                        "level": "Intermediate",
+                        "skills": json.dumps(["Swift", "iOS"]),
+                        "url": "https://udemy.com/swift",
+                        "rating": 4.6
+                    },
+                    {
+                        "id": str(uuid.uuid4()),
+                        "title": "SwiftUI Masterclass",
+                        "provider": "Coursera",
+                        "description": "Complete SwiftUI course",
+                        "duration_weeks": 10,
+                        "price": 79.99,
+                        "level": "Advanced",
+                        "skills": json.dumps(["SwiftUI", "iOS", "Combine"]),
+                        "url": "https://coursera.org/swiftui",
+                        "rating": 4.9
+                    }
+                ]
+                
+                for course in courses:
+                    cursor.execute('''
+                        INSERT INTO courses (id, title, provider, description, duration_weeks, price, level, skills, url, rating, updated_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                    ''', (
+                        course["id"],
+                        course["title"],
+                        course["provider"],
+                        course["description"],
+                        course["duration_weeks"],
+                        course["price"],
+                        course["level"],
+                        course["skills"],
+                        course["url"],
+                        course["rating"]
+                    ))
+                    self._index_course_skills(conn, course["id"], json.loads(course["skills"]))
+            
+            # Sample target role requirements: skill -> (required level, weight)
+            cursor.execute("SELECT COUNT(*) FROM role_skills")
+            if cursor.fetchone()[0] == 0:
+                self._replace_role_requirements(conn, DEFAULT_TARGET_ROLE, {
+                    "Swift": (80.0, 1.5),
+                    "SwiftUI": (80.0, 1.5),
+                    "Combine": (70.0, 1.0),
+                    "iOS": (75.0, 1.0),
+                    "Git": (60.0, 0.5)
+                })
+            
+            # Sample skill prerequisites: skill -> skills to learn first
+            cursor.execute("SELECT COUNT(*) FROM skill_prerequisites")
+            if cursor.fetchone()[0] == 0:
+                self._add_skill_prerequisites(conn, {
+                    "iOS": ["Swift"],
+                    "SwiftUI": ["Swift", "iOS"],
+                    "Combine": ["Swift"]
+                })
+            
+            # Sample skill aliases for curriculum skill extraction
+            cursor.execute("SELECT COUNT(*) FROM skill_aliases")
+            if cursor.fetchone()[0] == 0:
+                self._add_skill_aliases(conn, {
+                    "SwiftUI": ["Swift UI"],
+                    "iOS": ["iPhone", "iPadOS", "UIKit"],
+                    "Git": ["GitHub", "GitLab", "version control"]
+                })
         
-        conn.commit()
-        conn.close()
+        if generated_password:
+            print(f"🔑 Sample user {SAMPLE_USER_EMAIL} created with password: {generated_password}")
     
     # User methods
-    def create_user(self, email: str, name: str, role: str = "student") -> Dict[str, Any]:
+    @writes
+    def create_user(
+        self,
+        email: str,
+        name: str,
+        role: str = "student",
+        target_role: Optional[str] = None,
+        password_hash: Optional[str] = None
+    ) -> Dict[str, Any]:
         """Create a new user"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
         user_id = str(uuid.uuid4())
-        cursor.execute('''
-            INSERT INTO users (id, email, name, role)
-            VALUES (?, ?, ?, ?)
-        ''', (user_id, email, name, role))
-        
-        conn.commit()
-        user = self.get_user_by_id(user_id)
-        conn.close()
-        return user
+        with self.write_pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO users (id, email, name, role, target_role, password_hash, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ''', (user_id, email, name, role, target_role or DEFAULT_TARGET_ROLE, password_hash))
+            self._log_changes(conn, "user", [(user_id, user_id)])
+            
+            cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,))
+            return dict(cursor.fetchone())
+    
+    @writes
+    def set_password_hash(self, user_id: str, password_hash: str):
+        """Store a user's password hash (a new password or a rehash at a new cost)"""
+        with self.write_pool.connection() as conn:
+            conn.execute("UPDATE users SET password_hash = ? WHERE id = ?", (password_hash, user_id))
     
     def get_user_by_id(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Get user by ID"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,))
-        row = cursor.fetchone()
-        conn.close()
+        with self.read_pool.connection() as conn:
+            row = conn.execute("SELECT * FROM users WHERE id = ?", (user_id,)).fetchone()
         
         if row:
             return dict(row)
@@ -190,11 +724,8 @@ class Database:
     
     def get_user_by_email(self, email: str) -> Optional[Dict[str, Any]]:
         """Get user by email"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM users WHERE email = ?", (email,))
-        row = cursor.fetchone()
-        conn.close()
+        with self.read_pool.connection() as conn:
+            row = conn.execute("SELECT * FROM users WHERE email = ?", (email,)).fetchone()
         
         if row:
             return dict(row)
@@ -202,198 +733,889 @@ class Database:
     
     def get_all_users(self) -> List[Dict[str, Any]]:
         """Get all users"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM users")
-        rows = cursor.fetchall()
-        conn.close()
+        with self.read_pool.connection() as conn:
+            rows = conn.execute("SELECT * FROM users").fetchall()
         return [dict(row) for row in rows]
     
+    def get_users_after(self, after_id: Optional[str], limit: int) -> List[Dict[str, Any]]:
+        """Get up to ``limit`` users ordered by id, starting after ``after_id``"""
+        with self.read_pool.connection() as conn:
+            rows = conn.execute(
+                "SELECT id, target_role FROM users WHERE id > ? ORDER BY id LIMIT ?", (after_id or "", limit)
+            ).fetchall()
+        return [dict(row) for row in rows]
+    
+    # Skill profile methods
+    def get_user_skill_levels(self, user_id: str) -> Dict[str, float]:
+        """Get a user's current skill levels by skill name"""
+        with self.read_pool.connection() as conn:
+            rows = conn.execute('''
+                SELECT s.name, us.level FROM user_skills us
+                JOIN skills s ON s.id = us.skill_id
+                WHERE us.user_id = ?
+            ''', (user_id,)).fetchall()
+        return {row["name"]: row["level"] for row in rows}
+    
+    def get_skill_levels_for_users(self, user_ids: List[str]) -> Dict[str, Dict[str, float]]:
+        """Get current skill levels for many users at once"""
+        levels: Dict[str, Dict[str, float]] = {user_id: {} for user_id in user_ids}
+        if not user_ids:
+            return levels
+        placeholders = ",".join("?" * len(user_ids))
+        with self.read_pool.connection() as conn:
+            rows = conn.execute(f'''
+                SELECT us.user_id, s.name, us.level FROM user_skills us
+                JOIN skills s ON s.id = us.skill_id
+                WHERE us.user_id IN ({placeholders})
+            ''', user_ids).fetchall()
+        for row in rows:
+            levels[row["user_id"]][row["name"]] = row["level"]
+        return levels
+    
+    @writes
+    def set_user_skill_levels(self, user_id: str, levels: Dict[str, float]) -> Dict[str, float]:
+        """Insert or update a user's skill levels"""
+        with self.write_pool.connection() as conn:
+            self._upsert_user_skill_levels(conn, user_id, levels)
+            conn.execute("UPDATE users SET updated_at = CURRENT_TIMESTAMP WHERE id = ?", (user_id,))
+            self._log_changes(conn, "user", [(user_id, user_id)])
+        return self.get_user_skill_levels(user_id)
+    
+    @classmethod
+    def _upsert_user_skill_levels(cls, conn: sqlite3.Connection, user_id: str, levels: Dict[str, float]):
+        if not levels:
+            return
+        skill_ids = cls._skill_ids(conn, list(levels))
+        conn.executemany('''
+            INSERT INTO user_skills (user_id, skill_id, level) VALUES (?, ?, ?)
+            ON CONFLICT (user_id, skill_id) DO UPDATE SET level = excluded.level
+        ''', [(user_id, skill_ids[name], level) for name, level in levels.items()])
+    
+    def get_role_requirements(self, role: str) -> Dict[str, Tuple[float, float]]:
+        """Get required level and weight per skill for a target role"""
+        with self.read_pool.connection() as conn:
+            rows = conn.execute('''
+                SELECT s.name, rs.required_level, rs.weight FROM role_skills rs
+                JOIN skills s ON s.id = rs.skill_id
+                WHERE rs.role = ?
+            ''', (role,)).fetchall()
+        return {row["name"]: (row["required_level"], row["weight"]) for row in rows}
+    
+    @writes
+    def set_role_requirements(self, role: str, requirements: Dict[str, Tuple[float, float]]) -> Dict[str, Tuple[float, float]]:
+        """Replace the skill requirements of a target role"""
+        with self.write_pool.connection() as conn:
+            self._replace_role_requirements(conn, role, requirements)
+        return self.get_role_requirements(role)
+    
+    @classmethod
+    def _replace_role_requirements(cls, conn: sqlite3.Connection, role: str, requirements: Dict[str, Tuple[float, float]]):
+        conn.execute("DELETE FROM role_skills WHERE role = ?", (role,))
+        if not requirements:
+            return
+        skill_ids = cls._skill_ids(conn, list(requirements))
+        conn.executemany(
+            "INSERT INTO role_skills (role, skill_id, required_level, weight) VALUES (?, ?, ?, ?)",
+            [(role, skill_ids[name], level, weight) for name, (level, weight) in requirements.items()]
+        )
+    
+    def get_skill_prerequisites(self) -> Dict[str, List[str]]:
+        """Get the skill prerequisite graph as skill name -> prerequisite names"""
+        with self.read_pool.connection() as conn:
+            rows = conn.execute('''
+                SELECT s.name AS skill, p.name AS prerequisite FROM skill_prerequisites sp
+                JOIN skills s ON s.id = sp.skill_id
+                JOIN skills p ON p.id = sp.prerequisite_id
+            ''').fetchall()
+        graph: Dict[str, List[str]] = {}
+        for row in rows:
+            graph.setdefault(row["skill"], []).append(row["prerequisite"])
+        return graph
+    
+    @writes
+    def add_skill_prerequisites(self, prerequisites: Dict[str, List[str]]) -> Dict[str, List[str]]:
+        """Add prerequisite edges to the skill graph"""
+        with self.write_pool.connection() as conn:
+            self._add_skill_prerequisites(conn, prerequisites)
+        return self.get_skill_prerequisites()
+    
+    @classmethod
+    def _add_skill_prerequisites(cls, conn: sqlite3.Connection, prerequisites: Dict[str, List[str]]):
+        names = list({name for skill, required in prerequisites.items() for name in [skill, *required]})
+        if not names:
+            return
+        skill_ids = cls._skill_ids(conn, names)
+        conn.executemany(
+            "INSERT OR IGNORE INTO skill_prerequisites (skill_id, prerequisite_id) VALUES (?, ?)",
+            [(skill_ids[skill], skill_ids[name]) for skill, required in prerequisites.items() for name in required]
+        )
+    
+    def get_skill_vocabulary(self) -> Dict[str, List[str]]:
+        """Every skill name with its aliases"""
+        with self.read_pool.connection() as conn:
+            rows = conn.execute('''
+                SELECT s.name AS skill, a.alias FROM skills s
+                LEFT JOIN skill_aliases a ON a.skill_id = s.id
+                ORDER BY s.name, a.alias
+            ''').fetchall()
+        vocabulary: Dict[str, List[str]] = {}
+        for row in rows:
+            aliases = vocabulary.setdefault(row["skill"], [])
+            if row["alias"]:
+                aliases.append(row["alias"])
+        return vocabulary
+    
+    @writes
+    def add_skill_aliases(self, aliases: Dict[str, List[str]]) -> Dict[str, List[str]]:
+        """Add aliases (skill name -> alternative spellings), creating missing skills"""
+        with self.write_pool.connection() as conn:
+            self._add_skill_aliases(conn, aliases)
+        return self.get_skill_vocabulary()
+    
+    @classmethod
+    def _add_skill_aliases(cls, conn: sqlite3.Connection, aliases: Dict[str, List[str]]):
+        skill_ids = cls._skill_ids(conn, list(aliases))
+        conn.executemany(
+            "INSERT OR REPLACE INTO skill_aliases (alias, skill_id) VALUES (?, ?)",
+            [(alias, skill_ids[skill]) for skill, names in aliases.items() for alias in names]
+        )
+    
+    # Batch job checkpoints
+    @writes
+    def start_job(self, name: str, restart: bool = False) -> Dict[str, Any]:
+        """Get a job's checkpoint, creating it (or resetting it if finished or ``restart``)"""
+        with self.write_pool.connection() as conn:
+            row = conn.execute("SELECT * FROM job_checkpoints WHERE name = ?", (name,)).fetchone()
+            if row is None or restart or row["finished_at"] is not None:
+                conn.execute('''
+                    INSERT INTO job_checkpoints (name, last_key, processed) VALUES (?, NULL, 0)
+                    ON CONFLICT (name) DO UPDATE SET
+                        last_key = NULL, processed = 0, finished_at = NULL,
+                        started_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
+                ''', (name,))
+                row = conn.execute("SELECT * FROM job_checkpoints WHERE name = ?", (name,)).fetchone()
+            return dict(row)
+    
+    @writes
+    def finish_job(self, name: str):
+        """Mark a job as finished"""
+        with self.write_pool.connection() as conn:
+            conn.execute(
+                "UPDATE job_checkpoints SET finished_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP WHERE name = ?",
+                (name,)
+            )
+    
+    def get_job(self, name: str) -> Optional[Dict[str, Any]]:
+        """Get a job's checkpoint"""
+        with self.read_pool.connection() as conn:
+            row = conn.execute("SELECT * FROM job_checkpoints WHERE name = ?", (name,)).fetchone()
+        return dict(row) if row else None
+    
     # Course methods
     def get_all_courses(self) -> List[Dict[str, Any]]:
         """Get all courses"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM courses")
-        rows = cursor.fetchall()
-        conn.close()
-        
-        courses = []
-        for row in rows:
-            course = dict(row)
-            # Parse skills JSON
-            if course["skills"]:
-                course["skills"] = json.loads(course["skills"])
-            else:
-                course["skills"] = []
-            courses.append(course)
-        return courses
+        return self._read_versioned("courses", self._load_all_courses, ("courses",), CATALOG_CACHE_TTL)[0]
     
+    def _load_all_courses(self, conn: sqlite3.Connection) -> List[Dict[str, Any]]:
+        rows = conn.execute("SELECT * FROM courses").fetchall()
+        return [self._course_from_row(row) for row in rows]
+    
+    @writes
     def create_course(self, course_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new course"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
         course_id = str(uuid.uuid4())
         skills_json = json.dumps(course_data.get("skills", []))
         
-        cursor.execute('''
-            INSERT INTO courses (id, title, provider, description, duration_weeks, price, level, skills, url, rating)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            course_id,
-            course_data["title"],
-            course_data["provider"],
-            course_data.get("description", ""),
-            course_data.get("duration_weeks", 0),
-            course_data.get("price", 0.0),
-            course_data.get("level", "Beginner"),
-            skills_json,
-            course_data.get("url"),
-            course_data.get("rating")
-        ))
-        
-        conn.commit()
-        course = self.get_course_by_id(course_id)
-        conn.close()
+        with self.write_pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO courses (id, title, provider, description, duration_weeks, price, level, skills, url, rating, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ''', (
+                course_id,
+                course_data["title"],
+                course_data["provider"],
+                course_data.get("description", ""),
+                course_data.get("duration_weeks", 0),
+                course_data.get("price", 0.0),
+                course_data.get("level", "Beginner"),
+                skills_json,
+                course_data.get("url"),
+                course_data.get("rating")
+            ))
+            self._index_course_skills(conn, course_id, course_data.get("skills", []))
+            self._bump_versions(conn, ["courses"])
+            self._log_changes(conn, "course", [(course_id, None)])
+            
+            cursor.execute("SELECT * FROM courses WHERE id = ?", (course_id,))
+            course = self._course_from_row(cursor.fetchone())
+        
+        self.cache.invalidate_prefix(("courses",))
         return course
     
+    @writes
+    def upsert_courses(self, courses: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Insert or update validated course rows (see course_import.py) in one transaction.
+        
+        Rows repeating an id are collapsed to the last one, so course_skills
+        matches the skills that end up in courses. Returns the rows written.
+        """
+        if not courses:
+            return []
+        courses = list({course["id"]: course for course in courses}.values())
+        
+        with self.write_pool.connection() as conn:
+            conn.executemany('''
+                INSERT INTO courses (id, title, provider, description, duration_weeks, price, level, skills, url, rating, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT (id) DO UPDATE SET
+                    title = excluded.title, provider = excluded.provider, description = excluded.description,
+                    duration_weeks = excluded.duration_weeks, price = excluded.price, level = excluded.level,
+                    skills = excluded.skills, url = excluded.url, rating = excluded.rating,
+                    updated_at = CURRENT_TIMESTAMP
+            ''', [
+                (
+                    course["id"],
+                    course["title"],
+                    course["provider"],
+                    course["description"],
+                    course["duration_weeks"],
+                    course["price"],
+                    course["level"],
+                    json.dumps(course["skills"]),
+                    course["url"],
+                    course["rating"]
+                )
+                for course in courses
+            ])
+            
+            # Re-derive course_skills for the whole chunk with one statement per table
+            conn.executemany("DELETE FROM course_skills WHERE course_id = ?", [(course["id"],) for course in courses])
+            names = list({name for course in courses for name in course["skills"]})
+            if names:
+                skill_ids = self._skill_ids(conn, names)
+                conn.executemany(
+                    "INSERT OR IGNORE INTO course_skills (skill_id, course_id) VALUES (?, ?)",
+                    [(skill_ids[name], course["id"]) for course in courses for name in course["skills"]]
+                )
+            self._bump_versions(conn, ["courses"])
+            self._log_changes(conn, "course", [(course["id"], None) for course in courses])
+        
+        self.cache.invalidate_prefix(("courses",))
+        self.cache.invalidate(*[("course", course["id"]) for course in courses])
+        return courses
+    
     def get_course_by_id(self, course_id: str) -> Optional[Dict[str, Any]]:
         """Get course by ID"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM courses WHERE id = ?", (course_id,))
-        row = cursor.fetchone()
-        conn.close()
-        
+        return self._read_versioned(
+            "courses", lambda conn: self._load_course(conn, course_id), ("course", course_id), CATALOG_CACHE_TTL
+        )[0]
+    
+    def _load_course(self, conn: sqlite3.Connection, course_id: str) -> Optional[Dict[str, Any]]:
+        row = conn.execute("SELECT * FROM courses WHERE id = ?", (course_id,)).fetchone()
         if row:
-            course = dict(row)
-            if course["skills"]:
-                course["skills"] = json.loads(course["skills"])
-            else:
-                course["skills"] = []
-            return course
+            return self._course_from_row(row)
         return None
     
+    def get_courses_by_skills(self, skills: List[str], match_all: bool = True) -> List[Dict[str, Any]]:
+        """Get courses teaching all (or any) of the given skills via the course_skills index"""
+        skill_filter = self._skill_filter(skills, match_all)
+        if skill_filter is None:
+            return []
+        
+        sql, params = skill_filter
+        with self.read_pool.connection() as conn:
+            rows = conn.execute(f"SELECT c.* FROM courses c WHERE c.id IN ({sql})", params).fetchall()
+        return [self._course_from_row(row) for row in rows]
+    
+    def get_courses_page(
+        self,
+        limit: Optional[int],
+        after_id: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        skills: Optional[List[str]] = None,
+        match_all: bool = True
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Up to ``limit`` (None for all) courses ordered by id after ``after_id``, as API payloads.
+        
+        Columns are aliased to the iOS ``fields`` in SQL and rows are encoded
+        straight into payload dicts. Returns the payloads and the id to pass
+        as ``after_id`` for the next page (None on the last page). The
+        unfiltered catalog is cached.
+        """
+        return self.get_courses_page_versioned(limit, after_id, fields, skills, match_all)[0]
+    
+    def get_courses_page_versioned(
+        self,
+        limit: Optional[int],
+        after_id: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        skills: Optional[List[str]] = None,
+        match_all: bool = True
+    ) -> Tuple[Tuple[List[Dict[str, Any]], Optional[str]], int, Optional[str]]:
+        """get_courses_page() result with the "courses" version it was read at"""
+        key = None
+        if limit is None and after_id is None and skills is None:
+            key = ("courses", "payloads", tuple(fields or ()))
+        return self._read_versioned(
+            "courses", lambda conn: self._load_courses_page(conn, limit, after_id, fields, skills, match_all), key, CATALOG_CACHE_TTL
+        )
+    
+    def _load_courses_page(
+        self,
+        conn: sqlite3.Connection,
+        limit: Optional[int],
+        after_id: Optional[str],
+        fields: Optional[List[str]],
+        skills: Optional[List[str]],
+        match_all: bool
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        select_sql, keys = course_select(fields)
+        where, params = [], []
+        if after_id is not None:
+            where.append("c.id > ?")
+            params.append(after_id)
+        if skills is not None:
+            skill_filter = self._skill_filter(skills, match_all)
+            if skill_filter is None:
+                return [], None
+            where.append(f"c.id IN ({skill_filter[0]})")
+            params.extend(skill_filter[1])
+        
+        where_sql = f"WHERE {' AND '.join(where)}" if where else ""
+        limit_sql = ""
+        if limit is not None:
+            # One extra row tells whether another page exists
+            limit_sql = "LIMIT ?"
+            params.append(limit + 1)
+        cursor = conn.cursor()
+        cursor.row_factory = None  # plain tuples, encoded below
+        rows = cursor.execute(f"SELECT {select_sql} FROM courses c {where_sql} ORDER BY c.id {limit_sql}", params).fetchall()
+        
+        next_after_id = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            next_after_id = rows[-1][keys.index("id") if "id" in keys else len(keys)]
+        return encode_rows(rows, keys), next_after_id
+    
+    def search_courses(self, query: str, limit: int = 20, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Full-text search over title, description, provider and skills, best matches first, as API payloads"""
+        return self.search_courses_versioned(query, limit, fields)[0]
+    
+    def search_courses_versioned(
+        self, query: str, limit: int = 20, fields: Optional[List[str]] = None
+    ) -> Tuple[List[Dict[str, Any]], int, Optional[str]]:
+        """search_courses() result with the "courses" version it was read at"""
+        return self._read_versioned("courses", lambda conn: self._search_courses(conn, query, limit, fields))
+    
+    def _search_courses(self, conn: sqlite3.Connection, query: str, limit: int, fields: Optional[List[str]]) -> List[Dict[str, Any]]:
+        terms = re.findall(r"\w+", query)
+        if not terms:
+            return []
+        select_sql, keys = course_select(fields)
+        
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        if self.fts_enabled:
+            # Every term is a quoted prefix query so partial input matches while typing
+            match = " ".join(f'"{term}"*' for term in terms)
+            rows = cursor.execute(f'''
+                SELECT {select_sql} FROM courses_fts
+                JOIN courses c ON c.rowid = courses_fts.rowid
+                WHERE courses_fts MATCH ?
+                ORDER BY bm25(courses_fts, 10.0, 2.0, 5.0, 4.0)
+                LIMIT ?
+            ''', (match, limit)).fetchall()
+        else:
+            where = " AND ".join(
+                "(c.title LIKE ? OR c.description LIKE ? OR c.provider LIKE ? OR c.skills LIKE ?)" for _ in terms
+            )
+            params = [f"%{term}%" for term in terms for _ in range(4)]
+            rows = cursor.execute(
+                f"SELECT {select_sql} FROM courses c WHERE {where} ORDER BY c.rating DESC LIMIT ?", (*params, limit)
+            ).fetchall()
+        return encode_rows(rows, keys)
+    
+    @staticmethod
+    def _skill_filter(skills: List[str], match_all: bool):
+        """Subquery selecting course ids that teach the given skills, or None if no skills"""
+        names = [name.strip() for name in skills if name and name.strip()]
+        if not names:
+            return None
+        
+        placeholders = ",".join("?" * len(names))
+        having = "HAVING COUNT(DISTINCT cs.skill_id) = ?" if match_all else ""
+        params: List[Any] = list(names)
+        if match_all:
+            params.append(len({name.lower() for name in names}))
+        
+        sql = f'''
+            SELECT cs.course_id FROM skills s
+            JOIN course_skills cs ON cs.skill_id = s.id
+            WHERE s.name IN ({placeholders})
+            GROUP BY cs.course_id
+            {having}
+        '''
+        return sql, params
+    
+    @staticmethod
+    def _course_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+        course = dict(row)
+        # Parse skills JSON
+        if "skills" in course:
+            course["skills"] = json.loads(course["skills"]) if course["skills"] else []
+        return course
+    
     # Gap Report methods
+    @writes
     def create_gap_report(self, user_id: str, readiness_score: float, skill_gaps: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Create a gap report"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
         report_id = str(uuid.uuid4())
         skill_gaps_json = json.dumps(skill_gaps)
         
-        cursor.execute('''
-            INSERT INTO gap_reports (id, user_id, readiness_score, skill_gaps)
-            VALUES (?, ?, ?, ?)
-        ''', (report_id, user_id, readiness_score, skill_gaps_json))
+        with self.write_pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO gap_reports (id, user_id, readiness_score, skill_gaps)
+                VALUES (?, ?, ?, ?)
+            ''', (report_id, user_id, readiness_score, skill_gaps_json))
+            self._bump_versions(conn, [f"gap_report:{user_id}"])
+            self._log_changes(conn, "gap_report", [(report_id, user_id)])
+            
+            cursor.execute("SELECT * FROM gap_reports WHERE id = ?", (report_id,))
+            report = self._gap_report_from_row(cursor.fetchone())
         
-        conn.commit()
-        report = self.get_gap_report_by_user_id(user_id)
-        conn.close()
+        self.cache.invalidate(("gap_report", user_id))
         return report
     
     def get_gap_report_by_user_id(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Get gap report by user ID"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM gap_reports WHERE user_id = ? ORDER BY generated_at DESC LIMIT 1", (user_id,))
-        row = cursor.fetchone()
-        conn.close()
+        return self.get_gap_report_versioned(user_id)[0]
+    
+    def get_gap_report_versioned(self, user_id: str) -> Tuple[Optional[Dict[str, Any]], int, Optional[str]]:
+        """Latest gap report with the "gap_report:<user_id>" version it was read at"""
+        return self._read_versioned(
+            f"gap_report:{user_id}", lambda conn: self._latest_gap_report(conn, user_id), ("gap_report", user_id), REPORT_CACHE_TTL
+        )
+    
+    @classmethod
+    def _latest_gap_report(cls, conn: sqlite3.Connection, user_id: str) -> Optional[Dict[str, Any]]:
+        row = conn.execute(
+            "SELECT * FROM gap_reports WHERE user_id = ? ORDER BY generated_at DESC, rowid DESC LIMIT 1", (user_id,)
+        ).fetchone()
+        return cls._gap_report_from_row(row) if row else None
+    
+    @writes
+    def save_gap_reports(self, reports: List[Tuple[str, float, List[Dict[str, Any]]]], checkpoint: Optional[Tuple[str, str, int]] = None):
+        """Insert many ``(user_id, readiness_score, skill_gaps)`` reports in one transaction.
+
+        If ``checkpoint`` is given as ``(job_name, last_key, processed_delta)``,
+        the job's progress is advanced in the same transaction.
+        """
+        rows = [(str(uuid.uuid4()), user_id, score, json.dumps(gaps)) for user_id, score, gaps in reports]
+        with self.write_pool.connection() as conn:
+            conn.executemany("INSERT INTO gap_reports (id, user_id, readiness_score, skill_gaps) VALUES (?, ?, ?, ?)", rows)
+            self._bump_versions(conn, [f"gap_report:{user_id}" for user_id, _, _ in reports])
+            self._log_changes(conn, "gap_report", [(report_id, user_id) for report_id, user_id, _, _ in rows])
+            if checkpoint:
+                name, last_key, processed = checkpoint
+                conn.execute('''
+                    UPDATE job_checkpoints
+                    SET last_key = ?, processed = processed + ?, updated_at = CURRENT_TIMESTAMP
+                    WHERE name = ?
+                ''', (last_key, processed, name))
         
-        if row:
-            report = dict(row)
-            if report["skill_gaps"]:
-                report["skill_gaps"] = json.loads(report["skill_gaps"])
-            else:
-                report["skill_gaps"] = []
-            return report
-        return None
+        self.cache.invalidate(*[("gap_report", user_id) for user_id, _, _ in reports])
+    
+    @staticmethod
+    def _gap_report_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+        report = dict(row)
+        report["skill_gaps"] = json.loads(report["skill_gaps"]) if report["skill_gaps"] else []
+        return report
     
     # Roadmap methods
+    @writes
     def create_roadmap(self, user_id: str, title: str, status: str, estimated_total_hours: int, steps: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Create a roadmap"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
         roadmap_id = str(uuid.uuid4())
-        steps_json = json.dumps(steps)
         
-        cursor.execute('''
-            INSERT INTO roadmaps (id, user_id, title, status, estimated_total_hours, steps)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (roadmap_id, user_id, title, status, estimated_total_hours, steps_json))
+        with self.write_pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO roadmaps (id, user_id, title, status, estimated_total_hours, updated_at)
+                VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ''', (roadmap_id, user_id, title, status, estimated_total_hours))
+            self._insert_roadmap_steps(conn, roadmap_id, steps)
+            self._bump_versions(conn, [f"roadmap:{user_id}"])
+            self._log_changes(conn, "roadmap", [(roadmap_id, user_id)])
+            
+            cursor.execute("SELECT * FROM roadmaps WHERE id = ?", (roadmap_id,))
+            roadmap = self._roadmap_from_row(conn, cursor.fetchone())
         
-        conn.commit()
-        roadmap = self.get_roadmap_by_user_id(user_id)
-        conn.close()
+        self.cache.invalidate(("roadmap_for_user", user_id))
         return roadmap
     
     def get_roadmap_by_user_id(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Get roadmap by user ID"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM roadmaps WHERE user_id = ? ORDER BY created_at DESC LIMIT 1", (user_id,))
-        row = cursor.fetchone()
-        conn.close()
-        
-        if row:
-            roadmap = dict(row)
-            if roadmap["steps"]:
-                roadmap["steps"] = json.loads(roadmap["steps"])
-            else:
-                roadmap["steps"] = []
-            return roadmap
-        return None
+        return self.get_roadmap_versioned(user_id)[0]
     
-    def update_roadmap_step(self, roadmap_id: str, step_id: str, status: str):
-        """Update roadmap step status"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+    def get_roadmap_versioned(self, user_id: str) -> Tuple[Optional[Dict[str, Any]], int, Optional[str]]:
+        """Latest roadmap with the "roadmap:<user_id>" version it was read at"""
+        return self._read_versioned(
+            f"roadmap:{user_id}", lambda conn: self._latest_roadmap(conn, user_id), ("roadmap_for_user", user_id), REPORT_CACHE_TTL
+        )
+    
+    @classmethod
+    def _latest_roadmap(cls, conn: sqlite3.Connection, user_id: str) -> Optional[Dict[str, Any]]:
+        row = conn.execute(
+            "SELECT * FROM roadmaps WHERE user_id = ? ORDER BY created_at DESC, rowid DESC LIMIT 1", (user_id,)
+        ).fetchone()
+        return cls._roadmap_from_row(conn, row) if row else None
+    
+    @writes
+    def update_roadmap_step(self, roadmap_id: str, step_id: str, status: str, expected_version: Optional[int] = None):
+        """Update roadmap step status.
         
-        # Get roadmap
-        cursor.execute("SELECT * FROM roadmaps WHERE id = ?", (roadmap_id,))
-        row = cursor.fetchone()
-        if not row:
-            conn.close()
-            return None
+        When ``expected_version`` is given the update only applies if the step
+        is still at that version; otherwise VersionConflictError is raised.
+        Returns None if the step does not exist.
+        """
+        with self.write_pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                UPDATE roadmap_steps
+                SET status = ?, version = version + 1, updated_at = CURRENT_TIMESTAMP
+                WHERE roadmap_id = ? AND id = ? AND (? IS NULL OR version = ?)
+            ''', (status, roadmap_id, step_id, expected_version, expected_version))
+            
+            if cursor.rowcount == 0:
+                cursor.execute("SELECT version FROM roadmap_steps WHERE roadmap_id = ? AND id = ?", (roadmap_id, step_id))
+                row = cursor.fetchone()
+                if row is None:
+                    return None
+                raise VersionConflictError(row["version"])
+            
+            cursor.execute("UPDATE roadmaps SET updated_at = CURRENT_TIMESTAMP WHERE id = ?", (roadmap_id,))
+            cursor.execute("SELECT * FROM roadmaps WHERE id = ?", (roadmap_id,))
+            roadmap = self._roadmap_from_row(conn, cursor.fetchone())
+            self._bump_versions(conn, [f"roadmap:{roadmap['user_id']}"])
+            self._log_changes(conn, "roadmap", [(roadmap_id, roadmap["user_id"])])
         
+        self.cache.invalidate(("roadmap_for_user", roadmap["user_id"]))
+        return roadmap
+    
+    def get_roadmap_by_id(self, roadmap_id: str) -> Optional[Dict[str, Any]]:
+        """Get roadmap by ID"""
+        with self.read_pool.connection() as conn:
+            row = conn.execute("SELECT * FROM roadmaps WHERE id = ?", (roadmap_id,)).fetchone()
+            
+            if row:
+                return self._roadmap_from_row(conn, row)
+        return None
+    
+    @staticmethod
+    def _insert_roadmap_steps(conn: sqlite3.Connection, roadmap_id: str, steps: List[Dict[str, Any]]):
+        conn.executemany('''
+            INSERT OR IGNORE INTO roadmap_steps
+                (roadmap_id, id, step_order, title, description, skill_name, course_id, est_hours, status)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [
+            (
+                roadmap_id,
+                step.get("id") or str(uuid.uuid4()),
+                step.get("stepOrder", order),
+                step.get("title", ""),
+                step.get("description", ""),
+                step.get("skillName"),
+                step.get("courseId"),
+                step.get("estHours", 0),
+                step.get("status", "Pending")
+            )
+            for order, step in enumerate(steps, start=1)
+        ])
+    
+    @staticmethod
+    def _roadmap_from_row(conn: sqlite3.Connection, row: sqlite3.Row) -> Dict[str, Any]:
         roadmap = dict(row)
-        steps = json.loads(roadmap["steps"]) if roadmap["steps"] else []
-        
-        # Update step
-        for step in steps:
-            if step["id"] == step_id:
-                step["status"] = status
-                break
+        roadmap.pop("steps", None)
+        step_rows = conn.execute(
+            "SELECT * FROM roadmap_steps WHERE roadmap_id = ? ORDER BY step_order", (roadmap["id"],)
+        ).fetchall()
+        roadmap["steps"] = [
+            {
+                "id": step["id"],
+                "stepOrder": step["step_order"],
+                "title": step["title"],
+                "description": step["description"],
+                "skillName": step["skill_name"],
+                "courseId": step["course_id"],
+                "estHours": step["est_hours"],
+                "status": step["status"],
+                "version": step["version"]
+            }
+            for step in step_rows
+        ]
+        return roadmap
+    
+    # Curriculum methods
+    @writes
+    def create_curriculum(self, title: str, file_path: str, file_size: int, user_id: Optional[str] = None) -> Dict[str, Any]:
+        """Record an uploaded curriculum awaiting parsing"""
+        curriculum_id = str(uuid.uuid4())
         
-        # Save updated steps
-        steps_json = json.dumps(steps)
-        cursor.execute('''
-            UPDATE roadmaps SET steps = ? WHERE id = ?
-        ''', (steps_json, roadmap_id))
+        with self.write_pool.connection() as conn:
+            conn.execute('''
+                INSERT INTO curricula (id, user_id, title, file_path, file_size)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (curriculum_id, user_id, title, file_path, file_size))
+            row = conn.execute("SELECT * FROM curricula WHERE id = ?", (curriculum_id,)).fetchone()
         
-        conn.commit()
-        conn.close()
-        return self.get_roadmap_by_id(roadmap_id)
+        curriculum = dict(row)
+        curriculum["modules"] = []
+        return curriculum
     
-    def get_roadmap_by_id(self, roadmap_id: str) -> Optional[Dict[str, Any]]:
-        """Get roadmap by ID"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM roadmaps WHERE id = ?", (roadmap_id,))
-        row = cursor.fetchone()
-        conn.close()
+    @writes
+    def update_curriculum_status(self, curriculum_id: str, status: str, error: Optional[str] = None):
+        """Move a curriculum to ``status``, recording ``error`` for failures"""
+        with self.write_pool.connection() as conn:
+            conn.execute(
+                "UPDATE curricula SET status = ?, error = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                (status, error, curriculum_id)
+            )
+    
+    @writes
+    def save_curriculum_modules(
+        self,
+        curriculum_id: str,
+        modules: List[Dict[str, Any]],
+        skills: Optional[List[Tuple[str, str, int]]] = None
+    ):
+        """Replace a curriculum's modules (and their ``(module_id, skill, mentions)``) and mark it Completed in one transaction"""
+        with self.write_pool.connection() as conn:
+            conn.execute("DELETE FROM curriculum_modules WHERE curriculum_id = ?", (curriculum_id,))
+            conn.executemany('''
+                INSERT INTO curriculum_modules (curriculum_id, id, order_idx, title, description, hours_estimate)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', [
+                (
+                    curriculum_id,
+                    module.get("id") or str(uuid.uuid4()),
+                    module["orderIdx"],
+                    module["title"],
+                    module.get("description", ""),
+                    module.get("hoursEstimate", 0)
+                )
+                for module in modules
+            ])
+            self._replace_curriculum_skills(conn, curriculum_id, skills or [])
+            conn.execute(
+                "UPDATE curricula SET status = 'Completed', error = NULL, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                (curriculum_id,)
+            )
+    
+    def get_curriculum(self, curriculum_id: str, with_modules: bool = True) -> Optional[Dict[str, Any]]:
+        """Get a curriculum, with its modules in order unless ``with_modules`` is False"""
+        with self.read_pool.connection() as conn:
+            row = conn.execute("SELECT * FROM curricula WHERE id = ?", (curriculum_id,)).fetchone()
+            if row is None:
+                return None
+            curriculum = dict(row)
+            if not with_modules:
+                return curriculum
+            curriculum["modules"] = [
+                dict(module)
+                for module in conn.execute(
+                    "SELECT * FROM curriculum_modules WHERE curriculum_id = ? ORDER BY order_idx", (curriculum_id,)
+                )
+            ]
+        return curriculum
+    
+    def get_unfinished_curricula(self) -> List[Dict[str, Any]]:
+        """Curricula still Pending or Parsing, oldest first"""
+        with self.read_pool.connection() as conn:
+            rows = conn.execute(
+                "SELECT id, file_path FROM curricula WHERE status IN ('Pending', 'Parsing') ORDER BY created_at"
+            ).fetchall()
+        return [dict(row) for row in rows]
+    
+    @writes
+    def save_curriculum_skills(self, curriculum_id: str, skills: List[Tuple[str, str, int]]):
+        """Replace a curriculum's ``(module_id, skill, mentions)`` rows"""
+        with self.write_pool.connection() as conn:
+            self._replace_curriculum_skills(conn, curriculum_id, skills)
+    
+    @classmethod
+    def _replace_curriculum_skills(cls, conn: sqlite3.Connection, curriculum_id: str, skills: List[Tuple[str, str, int]]):
+        conn.execute("DELETE FROM curriculum_skills WHERE curriculum_id = ?", (curriculum_id,))
+        if not skills:
+            return
+        skill_ids = cls._skill_ids(conn, list({skill for _, skill, _ in skills}))
+        conn.executemany(
+            "INSERT INTO curriculum_skills (curriculum_id, module_id, skill_id, mentions) VALUES (?, ?, ?, ?)",
+            [(curriculum_id, module_id, skill_ids[skill], mentions) for module_id, skill, mentions in skills]
+        )
+    
+    def get_curriculum_skills(self, curriculum_id: str) -> List[Dict[str, Any]]:
+        """Skills taught by a curriculum with total mentions and module count, most mentioned first"""
+        with self.read_pool.connection() as conn:
+            rows = conn.execute('''
+                SELECT s.name AS skill, SUM(cs.mentions) AS mentions, COUNT(*) AS modules
+                FROM curriculum_skills cs JOIN skills s ON s.id = cs.skill_id
+                WHERE cs.curriculum_id = ?
+                GROUP BY cs.skill_id
+                ORDER BY mentions DESC, s.name
+            ''', (curriculum_id,)).fetchall()
+        return [dict(row) for row in rows]
+    
+    def get_curricula_by_skill(self, skill: str) -> List[Dict[str, Any]]:
+        """Curricula that teach a skill, most mentions first"""
+        with self.read_pool.connection() as conn:
+            rows = conn.execute('''
+                SELECT c.id, c.title, SUM(cs.mentions) AS mentions
+                FROM skills s
+                JOIN curriculum_skills cs ON cs.skill_id = s.id
+                JOIN curricula c ON c.id = cs.curriculum_id
+                WHERE s.name = ?
+                GROUP BY cs.curriculum_id
+                ORDER BY mentions DESC
+            ''', (skill,)).fetchall()
+        return [dict(row) for row in rows]
+    
+    def get_curriculum_module_texts(self) -> List[Tuple[str, str, str]]:
+        """``(curriculum_id, module_id, title + description)`` of every Completed curriculum"""
+        with self.read_pool.connection() as conn:
+            rows = conn.execute('''
+                SELECT m.curriculum_id, m.id, m.title || char(10) || IFNULL(m.description, '')
+                FROM curricula c JOIN curriculum_modules m ON m.curriculum_id = c.id
+                WHERE c.status = 'Completed'
+            ''').fetchall()
+        return [tuple(row) for row in rows]
+    
+    # Sync methods
+    def get_changes_since(self, user_id: str, since: Optional[int] = None, max_changes: int = SYNC_MAX_CHANGES) -> Dict[str, Any]:
+        """Rows a user's client needs after change_log position ``since``, read from one snapshot.
         
-        if row:
-            roadmap = dict(row)
-            if roadmap["steps"]:
-                roadmap["steps"] = json.loads(roadmap["steps"])
+        Returns ``{"seq", "full", "user", "courses", "gap_report", "roadmap"}``
+        where ``seq`` is the position to sync from next time and ``courses``
+        are API payloads. Without
+        ``since``, with an unknown position, with a position older than the
+        oldest retained change, or with more than ``max_changes`` pending
+        changes everything is returned (``full`` is True); otherwise only the
+        user, courses, latest report and latest roadmap that changed.
+        """
+        with self.read_pool.connection() as conn:
+            conn.execute("BEGIN")
+            oldest, seq = conn.execute("SELECT MIN(seq), COALESCE(MAX(seq), 0) FROM change_log").fetchone()
+            
+            # Changes after ``since`` are only complete if nothing after it was trimmed
+            full = since is None or since > seq or (oldest is not None and since < oldest - 1)
+            changed: Dict[str, List[str]] = {}
+            if not full:
+                rows = conn.execute('''
+                    SELECT DISTINCT entity, entity_id FROM change_log
+                    WHERE seq > ? AND seq <= ? AND (user_id IS NULL OR user_id = ?)
+                    LIMIT ?
+                ''', (since, seq, user_id, max_changes + 1)).fetchall()
+                full = len(rows) > max_changes
+                for row in rows:
+                    changed.setdefault(row["entity"], []).append(row["entity_id"])
+            
+            result: Dict[str, Any] = {"seq": seq, "full": full, "user": None, "courses": [], "gap_report": None, "roadmap": None}
+            
+            if full or "user" in changed:
+                row = conn.execute("SELECT * FROM users WHERE id = ?", (user_id,)).fetchone()
+                if row:
+                    result["user"] = dict(row)
+                    result["user"]["skills"] = {
+                        skill["name"]: skill["level"] for skill in conn.execute('''
+                            SELECT s.name, us.level FROM user_skills us
+                            JOIN skills s ON s.id = us.skill_id
+                            WHERE us.user_id = ?
+                        ''', (user_id,))
+                    }
+            
+            # Courses go out as API payloads, aliased in SQL like get_courses_page
+            select_sql, keys = course_select()
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            if full:
+                course_rows = cursor.execute(f"SELECT {select_sql} FROM courses c ORDER BY c.id").fetchall()
+            elif "course" in changed:
+                placeholders = ",".join("?" * len(changed["course"]))
+                course_rows = cursor.execute(
+                    f"SELECT {select_sql} FROM courses c WHERE c.id IN ({placeholders}) ORDER BY c.id", changed["course"]
+                ).fetchall()
             else:
-                roadmap["steps"] = []
-            return roadmap
-        return None
+                course_rows = []
+            result["courses"] = encode_rows(course_rows, keys)
+            
+            if full or "gap_report" in changed:
+                result["gap_report"] = self._latest_gap_report(conn, user_id)
+            
+            if full or "roadmap" in changed:
+                result["roadmap"] = self._latest_roadmap(conn, user_id)
+        
+        return result
+    
+    def get_dashboard(self, user_id: str) -> Dict[str, Any]:
+        """User, latest gap report and latest roadmap read on one connection in one snapshot"""
+        with self.read_pool.connection() as conn:
+            conn.execute("BEGIN")
+            row = conn.execute("SELECT id, email, name, role, target_role FROM users WHERE id = ?", (user_id,)).fetchone()
+            return {
+                "user": dict(row) if row else None,
+                "gap_report": self._latest_gap_report(conn, user_id),
+                "roadmap": self._latest_roadmap(conn, user_id)
+            }
+
+# Schema migrations
+#
+# Applied once, in version order, at startup and recorded in
+# schema_migrations. Each must be safe to re-run against a database that
+# already has the change. Never edit an applied migration; append a new one.
+
+def _add_column(conn: sqlite3.Connection, table: str, column: str, definition: str):
+    """Add a column to an existing table if it is missing"""
+    if column not in {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+def _backfill_course_skills(conn: sqlite3.Connection):
+    """Index skills of courses that only have the legacy courses.skills JSON column"""
+    rows = conn.execute('''
+        SELECT id, skills FROM courses
+        WHERE skills IS NOT NULL AND skills != '[]'
+          AND NOT EXISTS (SELECT 1 FROM course_skills cs WHERE cs.course_id = courses.id)
+    ''').fetchall()
+    for row in rows:
+        Database._index_course_skills(conn, row["id"], json.loads(row["skills"]))
+
+def _add_updated_at(conn: sqlite3.Connection):
+    """Track last modification of users, courses and roadmaps for delta sync"""
+    for table in ("users", "courses", "roadmaps"):
+        _add_column(conn, table, "updated_at", "TEXT")
+        conn.execute(f"UPDATE {table} SET updated_at = created_at WHERE updated_at IS NULL")
+
+def _move_roadmap_steps(conn: sqlite3.Connection):
+    """Move steps from the legacy roadmaps.steps JSON column into roadmap_steps"""
+    rows = conn.execute("SELECT id, steps FROM roadmaps WHERE steps IS NOT NULL").fetchall()
+    for row in rows:
+        Database._insert_roadmap_steps(conn, row["id"], json.loads(row["steps"]) if row["steps"] else [])
+    conn.execute("UPDATE roadmaps SET steps = NULL WHERE steps IS NOT NULL")
+
+MIGRATIONS = [
+    (1, "add users.target_role", lambda conn: _add_column(conn, "users", "target_role", "TEXT")),
+    (2, "backfill course_skills", _backfill_course_skills),
+    (3, "move roadmap steps to roadmap_steps", _move_roadmap_steps),
+    # Latest report / roadmap per user: the index is scanned backwards for
+    # ORDER BY ... DESC, rowid DESC, which a DESC index could not serve without a sort
+    (4, "index gap_reports by user and time",
+     lambda conn: conn.execute("CREATE INDEX IF NOT EXISTS idx_gap_reports_user_generated ON gap_reports(user_id, generated_at)")),
+    (5, "index roadmaps by user and time",
+     lambda conn: conn.execute("CREATE INDEX IF NOT EXISTS idx_roadmaps_user_created ON roadmaps(user_id, created_at)")),
+    (6, "index roadmap_steps by order",
+     lambda conn: conn.execute("CREATE INDEX IF NOT EXISTS idx_roadmap_steps_order ON roadmap_steps(roadmap_id, step_order)")),
+    (7, "add updated_at to users, courses and roadmaps", _add_updated_at),
+]
 
 # Global database instance
 db = Database()
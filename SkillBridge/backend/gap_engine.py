@@ -0,0 +1,99 @@
+"""
+Skill gap analysis engine for SkillBridge
+
+Scores users against a target role by comparing skill-level vectors.
+Levels are on a 0-100 scale; a role requires a level and a weight per skill.
+"""
+
+import uuid
+from dataclasses import dataclass
+from typing import List, Dict, Any, Tuple
+
+import numpy as np
+
+# Relative gap (gap / required level) at which a skill enters each band
+HIGH_PRIORITY_THRESHOLD = 0.5
+MEDIUM_PRIORITY_THRESHOLD = 0.25
+
+PRIORITY_LABELS = np.array(["Low", "Medium", "High"])
+
+
+@dataclass
+class RoleProfile:
+    """Required level and weight for every skill of a target role, as aligned vectors"""
+    role: str
+    skills: List[str]
+    required: np.ndarray
+    weights: np.ndarray
+
+    @classmethod
+    def from_requirements(cls, role: str, requirements: Dict[str, Tuple[float, float]]) -> "RoleProfile":
+        """Build a profile from ``{skill_name: (required_level, weight)}``"""
+        skills = sorted(requirements)
+        required = np.array([requirements[name][0] for name in skills], dtype=np.float64)
+        weights = np.array([requirements[name][1] for name in skills], dtype=np.float64)
+        return cls(role=role, skills=skills, required=required, weights=weights)
+
+    def level_matrix(self, users_levels: List[Dict[str, float]]) -> np.ndarray:
+        """Users x skills matrix of current levels aligned to this profile; unknown skills are 0"""
+        index = {name.lower(): i for i, name in enumerate(self.skills)}
+        levels = np.zeros((len(users_levels), len(self.skills)), dtype=np.float64)
+        for row, user_levels in enumerate(users_levels):
+            for name, level in user_levels.items():
+                column = index.get(name.lower())
+                if column is not None:
+                    levels[row, column] = level
+        return levels
+
+
+@dataclass
+class GapScores:
+    """Vectorized scoring result for a batch of users"""
+    current: np.ndarray      # users x skills
+    gaps: np.ndarray         # users x skills, clipped at 0
+    priorities: np.ndarray   # users x skills, index into PRIORITY_LABELS
+    readiness: np.ndarray    # users
+
+
+def score(profile: RoleProfile, levels: np.ndarray) -> GapScores:
+    """Score a users x skills level matrix against a role profile"""
+    levels = np.clip(np.atleast_2d(levels), 0.0, 100.0)
+    required = profile.required[np.newaxis, :]
+
+    gaps = np.clip(required - levels, 0.0, None)
+    relative = np.divide(gaps, required, out=np.zeros_like(gaps), where=required > 0)
+    priorities = np.select(
+        [relative >= HIGH_PRIORITY_THRESHOLD, relative >= MEDIUM_PRIORITY_THRESHOLD],
+        [2, 1],
+        default=0
+    )
+
+    # Weighted share of required level already covered, capped per skill
+    covered = np.minimum(levels, required) @ profile.weights
+    total = float(profile.required @ profile.weights)
+    readiness = np.round(100.0 * covered / total, 1) if total > 0 else np.full(levels.shape[0], 100.0)
+
+    return GapScores(current=levels, gaps=gaps, priorities=priorities, readiness=readiness)
+
+
+def skill_gaps(profile: RoleProfile, scores: GapScores, row: int = 0) -> List[Dict[str, Any]]:
+    """SkillGap dicts for one scored user, highest priority and largest gap first"""
+    gaps = scores.gaps[row]
+    open_skills = np.flatnonzero(gaps > 0)
+    order = open_skills[np.lexsort((-gaps[open_skills], -scores.priorities[row, open_skills]))]
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "skillName": profile.skills[i],
+            "currentLevel": float(scores.current[row, i]),
+            "requiredLevel": float(profile.required[i]),
+            "priority": str(PRIORITY_LABELS[scores.priorities[row, i]])
+        }
+        for i in order
+    ]
+
+
+def analyze(profile: RoleProfile, current_levels: Dict[str, float]) -> Tuple[float, List[Dict[str, Any]]]:
+    """Readiness score and skill gaps for a single user"""
+    scores = score(profile, profile.level_matrix([current_levels]))
+    return float(scores.readiness[0]), skill_gaps(profile, scores)
@@ -10,6 +10,8 @@ from typing import List, Optional
 from datetime import datetime
 import uvicorn
 import uuid
+import gap_engine
+from memory_store import UserRepository, UserExistsError, KeyedStore
 
 app = FastAPI(title="SkillBridge API", version="1.0.0")
 
@@ -63,6 +65,9 @@ class GapReport(BaseModel):
     skillGaps: List[SkillGap]
     generatedAt: str
 
+class RoadmapRequest(BaseModel):
+    userId: str
+
 class RoadmapStep(BaseModel):
     id: str
     stepOrder: int
@@ -95,20 +100,34 @@ class Course(BaseModel):
 # ========== In-Memory Database (Simple Storage) ==========
 
 # Mock data storage
-users_db = {}
+users_db = UserRepository()
 courses_db = []
-gap_reports_db = {}
-roadmaps_db = {}
+gap_reports_db = KeyedStore()
+roadmaps_db = KeyedStore()
+user_skills_db = {}
+
+# Target role requirements: skill -> (required level, weight)
+DEFAULT_TARGET_ROLE = "iOS Developer"
+role_requirements_db = {
+    DEFAULT_TARGET_ROLE: {
+        "Swift": (80.0, 1.5),
+        "SwiftUI": (80.0, 1.5),
+        "Combine": (70.0, 1.0),
+        "iOS": (75.0, 1.0),
+        "Git": (60.0, 0.5)
+    }
+}
 
 # Initialize with sample data
 def init_sample_data():
     # Sample user
-    user_id = str(uuid.uuid4())
-    users_db[user_id] = {
-        "id": user_id,
-        "email": "student@iitu.kz",
-        "name": "Nurislam Kenzheyev",
-        "role": "student"
+    user_id = users_db.create("student@iitu.kz", "Nurislam Kenzheyev").id
+    user_skills_db[user_id] = {
+        "Swift": 60.0,
+        "SwiftUI": 40.0,
+        "Combine": 20.0,
+        "iOS": 50.0,
+        "Git": 70.0
     }
     
     # Sample courses
@@ -157,55 +176,40 @@ async def root():
 async def login(request: LoginRequest):
     """Login endpoint"""
     # Simple authentication (in production, verify password hash)
-    user_id = None
-    for uid, user in users_db.items():
-        if user["email"] == request.email:
-            user_id = uid
-            break
-    
-    if not user_id:
+    user = users_db.get_by_email(request.email)
+    if not user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
-    user = users_db[user_id]
-    token = generate_token(user_id)
+    token = generate_token(user.id)
     
     return LoginResponse(
         token=token,
-        user=User(**user)
+        user=User(**user.to_dict())
     )
 
 @app.post("/api/auth/register", response_model=LoginResponse)
 async def register(request: RegisterRequest):
     """Register endpoint"""
-    # Check if user exists
-    for user in users_db.values():
-        if user["email"] == request.email:
-            raise HTTPException(status_code=400, detail="User already exists")
+    # Create new user unless the email is taken
+    try:
+        new_user = users_db.create(request.email, request.name)
+    except UserExistsError:
+        raise HTTPException(status_code=400, detail="User already exists")
     
-    # Create new user
-    user_id = str(uuid.uuid4())
-    new_user = {
-        "id": user_id,
-        "email": request.email,
-        "name": request.name,
-        "role": "student"
-    }
-    users_db[user_id] = new_user
-    
-    token = generate_token(user_id)
+    token = generate_token(new_user.id)
     
     return LoginResponse(
         token=token,
-        user=User(**new_user)
+        user=User(**new_user.to_dict())
     )
 
 @app.get("/api/users/me", response_model=User)
 async def get_current_user():
     """Get current user (simplified - in production, verify token)"""
     # Return first user for demo
-    if users_db:
-        user_id = list(users_db.keys())[0]
-        return User(**users_db[user_id])
+    user = users_db.first()
+    if user:
+        return User(**user.to_dict())
     raise HTTPException(status_code=404, detail="User not found")
 
 @app.get("/api/courses", response_model=List[Course])
@@ -216,44 +220,29 @@ async def get_courses():
 @app.get("/api/gap-reports/{user_id}", response_model=GapReport)
 async def get_gap_report(user_id: str):
     """Get gap report for user"""
-    if user_id in gap_reports_db:
-        return GapReport(**gap_reports_db[user_id])
+    def build_report():
+        # Score the user's skill levels against the target role
+        profile = gap_engine.RoleProfile.from_requirements(
+            DEFAULT_TARGET_ROLE, role_requirements_db[DEFAULT_TARGET_ROLE]
+        )
+        readiness_score, skill_gaps = gap_engine.analyze(profile, user_skills_db.get(user_id, {}))
+        return {
+            "id": str(uuid.uuid4()),
+            "userId": user_id,
+            "readinessScore": readiness_score,
+            "skillGaps": skill_gaps,
+            "generatedAt": datetime.now().isoformat()
+        }
     
-    # Generate mock gap report
-    gap_report = {
-        "id": str(uuid.uuid4()),
-        "userId": user_id,
-        "readinessScore": 65.5,
-        "skillGaps": [
-            {
-                "id": str(uuid.uuid4()),
-                "skillName": "SwiftUI",
-                "currentLevel": 40.0,
-                "requiredLevel": 80.0,
-                "priority": "High"
-            },
-            {
-                "id": str(uuid.uuid4()),
-                "skillName": "Combine Framework",
-                "currentLevel": 20.0,
-                "requiredLevel": 70.0,
-                "priority": "High"
-            }
-        ],
-        "generatedAt": datetime.now().isoformat()
-    }
-    gap_reports_db[user_id] = gap_report
-    return GapReport(**gap_report)
+    return GapReport(**gap_reports_db.get_or_create(user_id, build_report))
 
 @app.post("/api/roadmaps/generate", response_model=Roadmap)
 async def generate_roadmap(request: RoadmapRequest):
     """Generate roadmap for user"""
     user_id = request.userId
-    if user_id in roadmaps_db:
-        return Roadmap(**roadmaps_db[user_id])
     
-    # Generate mock roadmap
-    roadmap = {
+    # Generate mock roadmap on first request
+    return Roadmap(**roadmaps_db.get_or_create(user_id, lambda: {
         "id": str(uuid.uuid4()),
         "userId": user_id,
         "title": "iOS Developer Roadmap",
@@ -278,9 +267,7 @@ async def generate_roadmap(request: RoadmapRequest):
             }
         ],
         "createdAt": datetime.now().isoformat()
-    }
-    roadmaps_db[user_id] = roadmap
-    return Roadmap(**roadmap)
+    }))
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
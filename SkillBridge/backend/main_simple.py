@@ -8,6 +8,7 @@ from typing import List, Optional, Dict, Any
 import uvicorn
 import uuid
 from datetime import datetime
+from memory_store import UserRepository, UserExistsError, KeyedStore
 
 app = FastAPI(title="SkillBridge API", version="1.0.0")
 
@@ -21,19 +22,13 @@ app.add_middleware(
 )
 
 # In-Memory Database
-users_db = {}
+users_db = UserRepository()
 courses_db = []
-gap_reports_db = {}
-roadmaps_db = {}
+gap_reports_db = KeyedStore()
+roadmaps_db = KeyedStore()
 
 def init_sample_data():
-    user_id = str(uuid.uuid4())
-    users_db[user_id] = {
-        "id": user_id,
-        "email": "student@iitu.kz",
-        "name": "Nurislam Kenzheyev",
-        "role": "student"
-    }
+    users_db.create("student@iitu.kz", "Nurislam Kenzheyev")
     
     courses_db.extend([
         {
@@ -61,18 +56,13 @@ async def login(request: Dict[str, Any]):
     email = request.get("email")
     password = request.get("password")
     
-    user_id = None
-    for uid, user in users_db.items():
-        if user["email"] == email:
-            user_id = uid
-            break
-    
-    if not user_id:
+    user = users_db.get_by_email(email)
+    if not user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
     return {
-        "token": f"token_{user_id}",
-        "user": users_db[user_id]
+        "token": f"token_{user.id}",
+        "user": user.to_dict()
     }
 
 @app.post("/api/auth/register")
@@ -80,29 +70,21 @@ async def register(request: Dict[str, Any]):
     email = request.get("email")
     name = request.get("name")
     
-    for user in users_db.values():
-        if user["email"] == email:
-            raise HTTPException(status_code=400, detail="User already exists")
-    
-    user_id = str(uuid.uuid4())
-    new_user = {
-        "id": user_id,
-        "email": email,
-        "name": name,
-        "role": "student"
-    }
-    users_db[user_id] = new_user
+    try:
+        new_user = users_db.create(email, name)
+    except UserExistsError:
+        raise HTTPException(status_code=400, detail="User already exists")
     
     return {
-        "token": f"token_{user_id}",
-        "user": new_user
+        "token": f"token_{new_user.id}",
+        "user": new_user.to_dict()
     }
 
 @app.get("/api/users/me")
 async def get_current_user():
-    if users_db:
-        user_id = list(users_db.keys())[0]
-        return users_db[user_id]
+    user = users_db.first()
+    if user:
+        return user.to_dict()
     raise HTTPException(status_code=404, detail="User not found")
 
 @app.get("/api/courses")
@@ -111,10 +93,7 @@ async def get_courses():
 
 @app.get("/api/gap-reports/{user_id}")
 async def get_gap_report(user_id: str):
-    if user_id in gap_reports_db:
-        return gap_reports_db[user_id]
-    
-    gap_report = {
+    return gap_reports_db.get_or_create(user_id, lambda: {
         "id": str(uuid.uuid4()),
         "userId": user_id,
         "readinessScore": 65.5,
@@ -128,18 +107,13 @@ async def get_gap_report(user_id: str):
             }
         ],
         "generatedAt": datetime.now().isoformat()
-    }
-    gap_reports_db[user_id] = gap_report
-    return gap_report
+    })
 
 @app.post("/api/roadmaps/generate")
 async def generate_roadmap(request: Dict[str, Any]):
     user_id = request.get("userId")
     
-    if user_id in roadmaps_db:
-        return roadmaps_db[user_id]
-    
-    roadmap = {
+    return roadmaps_db.get_or_create(user_id, lambda: {
         "id": str(uuid.uuid4()),
         "userId": user_id,
         "title": "iOS Developer Roadmap",
@@ -156,9 +130,7 @@ async def generate_roadmap(request: Dict[str, Any]):
             }
         ],
         "createdAt": datetime.now().isoformat()
-    }
-    roadmaps_db[user_id] = roadmap
-    return roadmap
+    })
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
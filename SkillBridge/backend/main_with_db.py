@@ -2,15 +2,35 @@
 SkillBridge Backend API with SQLite Database
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, BackgroundTasks, Depends, Header
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List, Optional, Dict, Any
+from fastapi.responses import JSONResponse, StreamingResponse, Response
+from typing import List, Optional, Dict, Any, AsyncIterator, Tuple, Union
 import uvicorn
+import asyncio
+import os
 import uuid
-from datetime import datetime
-from database import db
+import base64
+import binascii
+import hashlib
+import sqlite3
+import time
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from database import db, DEFAULT_TARGET_ROLE, VersionConflictError
+import gap_engine
+import recompute_gaps
+import recommendations
+import roadmap_generator
+import curricula
+import course_import
+import auth
+import passwords
+from async_database import async_db, DatabaseBusyError
+from serialization import COURSE_FIELDS, FastJSONResponse, dumps
+from compression import CompressionMiddleware, decoded_etag
 
-app = FastAPI(title="SkillBridge API", version="1.0.0")
+app = FastAPI(title="SkillBridge API", version="1.0.0", default_response_class=FastJSONResponse)
 
 # CORS middleware
 app.add_middleware(
@@ -21,35 +41,78 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# gzip / brotli for responses of 1 KB and more
+app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+@app.exception_handler(DatabaseBusyError)
+async def database_busy_handler(request: Request, exc: DatabaseBusyError):
+    return JSONResponse(status_code=503, content={"detail": "Database is busy, retry shortly"}, headers={"Retry-After": "1"})
+
+@app.exception_handler(passwords.PasswordHasherBusyError)
+async def password_hasher_busy_handler(request: Request, exc: passwords.PasswordHasherBusyError):
+    return JSONResponse(status_code=503, content={"detail": "Too many sign-ins at once, retry shortly"}, headers={"Retry-After": "1"})
+
+# Parses uploaded curricula off the request path
+curriculum_processor = curricula.CurriculumProcessor(db)
+
+# scrypt hashing and verification, kept off the event loop
+password_hasher = passwords.PasswordHasher()
+
+@app.on_event("startup")
+async def resume_curricula():
+    await asyncio.to_thread(curriculum_processor.resume_pending)
+
+@app.on_event("shutdown")
+async def shutdown_database():
+    curriculum_processor.shutdown()
+    password_hasher.shutdown()
+    async_db.shutdown()
+
 @app.get("/")
 async def root():
     return {"message": "SkillBridge API", "version": "1.0.0", "database": "SQLite"}
 
+@app.get("/api/stats/database")
+async def get_database_stats():
+    """Connection pool, query queue, read cache, curriculum worker, session cache and password pool statistics"""
+    return {
+        "pool": db.pool_stats(),
+        "queue": async_db.stats(),
+        "cache": db.cache.stats(),
+        "curricula": curriculum_processor.stats(),
+        "sessions": auth.session_cache.stats(),
+        "passwords": password_hasher.stats()
+    }
+
+def format_user(user: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": user["id"],
+        "email": user["email"],
+        "name": user["name"],
+        "role": user["role"]
+    }
+
 @app.post("/api/auth/login")
 async def login(request: Dict[str, Any]):
-    """Login endpoint"""
+    """Login endpoint; the scrypt check runs on the password hashing pool"""
     email = request.get("email")
     password = request.get("password")
+    if not isinstance(password, str) or not password:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
     
     # Find user by email
-    user = db.get_user_by_email(email)
+    user = await async_db.get_user_by_email(email)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
-    # Simple password check (in production, use hashed passwords)
-    # For now, any password works for demo
-    
-    token = f"token_{user['id']}_{uuid.uuid4().hex[:16]}"
+    # Accounts created before passwords were stored cannot sign in until one
+    # is set for them with `python passwords.py <email>`
+    if user["password_hash"] is None or not await password_hasher.verify(password, user["password_hash"]):
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    if passwords.needs_rehash(user["password_hash"]):
+        await async_db.set_password_hash(user["id"], await password_hasher.hash(password))
     
-    return {
-        "token": token,
-        "user": {
-            "id": user["id"],
-            "email": user["email"],
-            "name": user["name"],
-            "role": user["role"]
-        }
-    }
+    return {"token": auth.create_token(user["id"]), "user": format_user(user)}
 
 @app.post("/api/auth/register")
 async def register(request: Dict[str, Any]):
@@ -57,73 +120,140 @@ async def register(request: Dict[str, Any]):
     email = request.get("email")
     name = request.get("name")
     password = request.get("password")
+    # Validated before hashing, so a bad request never costs a scrypt run
+    if not isinstance(email, str) or "@" not in email.strip():
+        raise HTTPException(status_code=400, detail="A valid email is required")
+    if not isinstance(name, str) or not name.strip():
+        raise HTTPException(status_code=400, detail="Name is required")
+    if not isinstance(password, str) or len(password) < passwords.MIN_PASSWORD_LENGTH:
+        raise HTTPException(status_code=400, detail=f"Password must be at least {passwords.MIN_PASSWORD_LENGTH} characters")
+    email, name = email.strip(), name.strip()
     
     # Check if user exists
-    existing_user = db.get_user_by_email(email)
+    existing_user = await async_db.get_user_by_email(email)
     if existing_user:
         raise HTTPException(status_code=400, detail="User already exists")
     
     # Create new user
-    user = db.create_user(email=email, name=name, role="student")
+    password_hash = await password_hasher.hash(password)
+    try:
+        user = await async_db.create_user(email=email, name=name, role="student", password_hash=password_hash)
+    except sqlite3.IntegrityError as exc:
+        if "users.email" not in str(exc):
+            raise
+        # Registered concurrently while the password was being hashed
+        raise HTTPException(status_code=400, detail="User already exists")
     
-    token = f"token_{user['id']}_{uuid.uuid4().hex[:16]}"
+    return {"token": auth.create_token(user["id"]), "user": format_user(user)}
+
+async def current_user(authorization: Optional[str] = Header(None)) -> Dict[str, Any]:
+    """The user a Bearer token was issued to; 401 if it is missing, forged or expired.
+
+    Tokens are verified by signature alone. A verified token is cached with
+    its user for up to a minute (never past its expiry), so repeat requests
+    cost one dict lookup.
+    """
+    token = auth.bearer_token(authorization)
+    user = auth.session_cache.get(token) if token else None
+    if user is not None:
+        return user
     
-    return {
-        "token": token,
-        "user": {
-            "id": user["id"],
-            "email": user["email"],
-            "name": user["name"],
-            "role": user["role"]
-        }
-    }
+    claims = auth.verify_token(token) if token else None
+    if claims:
+        user_id, expires_at = claims
+        row = await async_db.get_user_by_id(user_id)
+        if row:
+            user = format_user(row)
+            auth.session_cache.set(token, user, ttl=min(auth.SESSION_CACHE_TTL, expires_at - time.time()))
+            return user
+    raise HTTPException(status_code=401, detail="Invalid or expired token", headers={"WWW-Authenticate": "Bearer"})
 
 @app.get("/api/users/me")
-async def get_current_user():
-    """Get current user (simplified - in production, verify token)"""
-    # Return first user for demo
-    users = db.get_all_users()
-    if users:
-        user = users[0]
-        return {
-            "id": user["id"],
-            "email": user["email"],
-            "name": user["name"],
-            "role": user["role"]
-        }
-    raise HTTPException(status_code=404, detail="User not found")
+async def get_current_user(user: Dict[str, Any] = Depends(current_user)):
+    """The user identified by the Authorization: Bearer token"""
+    return user
 
-@app.get("/api/courses")
-async def get_courses():
-    """Get all courses from database"""
-    courses = db.get_all_courses()
-    
-    # Format for iOS app
-    formatted_courses = []
-    for course in courses:
-        formatted_courses.append({
-            "id": course["id"],
-            "title": course["title"],
-            "provider": course["provider"],
-            "description": course.get("description", ""),
-            "durationWeeks": course.get("duration_weeks", 0),
-            "price": course.get("price", 0.0),
-            "level": course.get("level", "Beginner"),
-            "skills": course.get("skills", []),
-            "url": course.get("url"),
-            "rating": course.get("rating")
-        })
-    
-    return formatted_courses
+# Conditional requests
+#
+# ETags come from the entity_versions counters that database.py advances in
+# every write transaction, so a revalidation costs one primary-key lookup and
+# a 304 never touches the data itself. A 200 takes its validators from the
+# version the body was read at (the *_versioned getters), never from a
+# separate lookup, so a body can't go out under a newer ETag.
 
-@app.post("/api/courses")
-async def create_course(course_data: Dict[str, Any]):
-    """Create a new course"""
-    course = db.create_course(course_data)
-    return {
+def make_etag(key: str, version: int, variant: str = "") -> str:
+    """Strong ETag for one representation (query string, media type) of a versioned entity"""
+    digest = hashlib.blake2s(f"{key}|{version}|{variant}".encode(), digest_size=8).hexdigest()
+    return f'"{digest}"'
+
+def http_date(timestamp: str) -> str:
+    """SQLite CURRENT_TIMESTAMP (UTC) as an HTTP date"""
+    return format_datetime(datetime.fromisoformat(timestamp).replace(tzinfo=timezone.utc), usegmt=True)
+
+def settled(updated_at: str) -> bool:
+    """Whether ``updated_at`` lies before the current second.
+    
+    Timestamps have one-second resolution, so a Last-Modified from the
+    current second could still be followed by another write carrying the
+    same value; such dates are neither sent nor trusted for If-Modified-Since.
+    """
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    return datetime.fromisoformat(updated_at).replace(tzinfo=timezone.utc) < now
+
+def is_not_modified(request: Request, etag: str, updated_at: Optional[str]) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # Compressed responses carry the encoding in their ETag ("<tag>-br")
+        candidates = [decoded_etag(tag.strip().removeprefix("W/")) for tag in if_none_match.split(",")]
+        return "*" in candidates or etag in candidates
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and updated_at and settled(updated_at):
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return datetime.fromisoformat(updated_at).replace(tzinfo=timezone.utc) <= since
+    return False
+
+async def check_conditional(
+    request: Request,
+    key: str,
+    variant: str = "",
+    vary: Optional[str] = None
+) -> Tuple[Optional[Response], Dict[str, str]]:
+    """Validator headers for the current version of ``key``, plus a ready 304 response if the client copy is current"""
+    version, updated_at = await async_db.get_entity_version(key)
+    headers = validator_headers(key, version, updated_at, variant, vary)
+    if is_not_modified(request, headers["ETag"], updated_at):
+        return Response(status_code=304, headers=headers), headers
+    return None, headers
+
+def validator_headers(
+    key: str,
+    version: int,
+    updated_at: Optional[str],
+    variant: str = "",
+    vary: Optional[str] = None
+) -> Dict[str, str]:
+    """ETag / Last-Modified / Cache-Control headers for a body read at ``version`` of ``key``"""
+    headers = {"ETag": make_etag(key, version, variant), "Cache-Control": "no-cache"}
+    if vary:
+        headers["Vary"] = vary
+    if updated_at and settled(updated_at):
+        headers["Last-Modified"] = http_date(updated_at)
+    return headers
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+STREAM_BATCH_SIZE = 500
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+def format_course(course: Dict[str, Any], fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Format a course row for the iOS app, optionally projected to ``fields``"""
+    formatted = {
         "id": course["id"],
-        "title": course["title"],
-        "provider": course["provider"],
+        "title": course.get("title"),
+        "provider": course.get("provider"),
         "description": course.get("description", ""),
         "durationWeeks": course.get("duration_weeks", 0),
         "price": course.get("price", 0.0),
@@ -132,45 +262,210 @@ async def create_course(course_data: Dict[str, Any]):
         "url": course.get("url"),
         "rating": course.get("rating")
     }
+    if fields is None:
+        return formatted
+    return {field: formatted[field] for field in fields}
 
-@app.get("/api/gap-reports/{user_id}")
-async def get_gap_report(user_id: str):
-    """Get gap report for user from database"""
-    report = db.get_gap_report_by_user_id(user_id)
-    
-    if report:
-        return {
-            "id": report["id"],
-            "userId": report["user_id"],
-            "readinessScore": report["readiness_score"],
-            "skillGaps": report["skill_gaps"],
-            "generatedAt": report["generated_at"]
-        }
+def parse_course_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Parse a comma-separated ``fields=`` projection, rejecting unknown names"""
+    if not fields:
+        return None
+    field_names = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in field_names if field not in COURSE_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return field_names
+
+def encode_cursor(course_id: str) -> str:
+    return base64.urlsafe_b64encode(course_id.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> str:
+    try:
+        return base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    except (binascii.Error, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+async def iter_course_batches(
+    fields: Optional[List[str]],
+    skills: Optional[List[str]],
+    match_all: bool
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Yield every matching course payload, reading the table in keyset batches"""
+    after_id = None
+    while True:
+        batch, after_id = await async_db.get_courses_page(
+            STREAM_BATCH_SIZE,
+            after_id=after_id,
+            fields=fields,
+            skills=skills,
+            match_all=match_all
+        )
+        if batch:
+            yield batch
+        if after_id is None:
+            return
+
+async def stream_courses_json(batches: AsyncIterator[List[Dict[str, Any]]]) -> AsyncIterator[bytes]:
+    yield b"["
+    separator = b""
+    async for batch in batches:
+        # Encode the whole batch at once and drop its brackets
+        yield separator + dumps(batch)[1:-1]
+        separator = b","
+    yield b"]"
+
+async def stream_courses_ndjson(batches: AsyncIterator[List[Dict[str, Any]]]) -> AsyncIterator[bytes]:
+    async for batch in batches:
+        yield b"".join(dumps(course) + b"\n" for course in batch)
+
+@app.get("/api/courses")
+async def get_courses(
+    request: Request,
+    skills: Optional[str] = None,
+    match: str = "all",
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    stream: bool = False
+):
+    """Get courses from database, optionally filtered by comma-separated skills.
+
+    Passing ``limit`` or ``cursor`` switches to keyset pagination and returns
+    ``{"items": [...], "nextCursor": ...}``; without them the full list is
+    returned as before. ``stream=true`` (or ``Accept: application/x-ndjson``)
+    exports the whole result incrementally as a JSON array or NDJSON.
+    """
+    if match not in ("all", "any"):
+        raise HTTPException(status_code=400, detail="match must be 'all' or 'any'")
+    skill_names = skills.split(",") if skills else None
     
-    # Generate new gap report if doesn't exist
-    skill_gaps = [
-        {
-            "id": str(uuid.uuid4()),
-            "skillName": "SwiftUI",
-            "currentLevel": 40.0,
-            "requiredLevel": 80.0,
-            "priority": "High"
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "skillName": "Combine Framework",
-            "currentLevel": 20.0,
-            "requiredLevel": 70.0,
-            "priority": "High"
-        }
-    ]
+    field_names = parse_course_fields(fields)
     
-    report = db.create_gap_report(
-        user_id=user_id,
-        readiness_score=65.5,
-        skill_gaps=skill_gaps
+    ndjson = NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+    variant = f"{request.url.query}|{ndjson}"
+    not_modified, _ = await check_conditional(request, "courses", variant, vary="Accept")
+    if not_modified:
+        return not_modified
+    
+    if stream or ndjson:
+        # Batches are read in separate transactions, so no single version
+        # describes the export and it goes out without validators
+        headers = {"Cache-Control": "no-cache", "Vary": "Accept"}
+        batches = iter_course_batches(field_names, skill_names, match == "all")
+        if ndjson:
+            return StreamingResponse(stream_courses_ndjson(batches), media_type=NDJSON_MEDIA_TYPE, headers=headers)
+        return StreamingResponse(stream_courses_json(batches), media_type="application/json", headers=headers)
+    
+    if limit is None and cursor is None:
+        (courses, _), version, updated_at = await async_db.get_courses_page_versioned(
+            None, fields=field_names, skills=skill_names, match_all=match == "all"
+        )
+        return FastJSONResponse(courses, headers=validator_headers("courses", version, updated_at, variant, "Accept"))
+    
+    page_size = min(max(limit or DEFAULT_PAGE_SIZE, 1), MAX_PAGE_SIZE)
+    (courses, next_after_id), version, updated_at = await async_db.get_courses_page_versioned(
+        page_size,
+        after_id=decode_cursor(cursor) if cursor else None,
+        fields=field_names,
+        skills=skill_names,
+        match_all=match == "all"
     )
+    return FastJSONResponse({
+        "items": courses,
+        "nextCursor": encode_cursor(next_after_id) if next_after_id else None
+    }, headers=validator_headers("courses", version, updated_at, variant, "Accept"))
+
+@app.get("/api/courses/search")
+async def search_courses(request: Request, q: str, limit: int = DEFAULT_PAGE_SIZE, fields: Optional[str] = None):
+    """Full-text course search ranked by relevance (BM25), with prefix matching for type-ahead"""
+    field_names = parse_course_fields(fields)
+    not_modified, _ = await check_conditional(request, "courses", request.url.query)
+    if not_modified:
+        return not_modified
+    
+    courses, version, updated_at = await async_db.search_courses_versioned(
+        q, limit=min(max(limit, 1), MAX_PAGE_SIZE), fields=field_names
+    )
+    return FastJSONResponse(courses, headers=validator_headers("courses", version, updated_at, request.url.query))
+
+@app.post("/api/courses")
+async def create_course(course_data: Dict[str, Any]):
+    """Create a new course"""
+    course = await async_db.create_course(course_data)
+    recommendations.course_index.add_course(course)
+    roadmap_generator.invalidate_roadmap_plans()
+    return format_course(course)
+
+async def iter_ndjson_lines(request: Request) -> AsyncIterator[Tuple[int, Union[bytes, ValueError]]]:
+    """``(line number, line or ValueError)`` for each non-empty line of a streamed request body.
+
+    Each chunk is split once and only its unfinished last line is carried
+    over. A line longer than course_import.MAX_LINE_BYTES is dropped as it
+    arrives and reported as an error instead.
+    """
+    tail: List[bytes] = []
+    tail_size = 0
+    line_number = 0
+    async for chunk in request.stream():
+        *lines, rest = chunk.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if tail_size + len(line) > course_import.MAX_LINE_BYTES:
+                yield line_number, ValueError(course_import.LINE_TOO_LONG)
+            else:
+                if tail:
+                    line = b"".join(tail) + line
+                if line.strip():
+                    yield line_number, line
+            tail, tail_size = [], 0
+        tail_size += len(rest)
+        if tail_size > course_import.MAX_LINE_BYTES:
+            tail = []
+        elif rest:
+            tail.append(rest)
+    if tail_size > course_import.MAX_LINE_BYTES:
+        yield line_number + 1, ValueError(course_import.LINE_TOO_LONG)
+    elif tail:
+        line = b"".join(tail)
+        if line.strip():
+            yield line_number + 1, line
+
+@app.post("/api/courses/bulk")
+async def bulk_create_courses(request: Request, chunk_size: int = course_import.DEFAULT_CHUNK_SIZE):
+    """Create or update courses from an NDJSON body, one course object per line.
+
+    The body is parsed as it arrives and valid rows are upserted in chunks
+    of ``chunk_size`` per transaction; invalid rows are skipped and reported
+    by line number.
+    """
+    bulk = course_import.BulkImport(min(chunk_size, course_import.MAX_CHUNK_SIZE))
+    
+    async def save_chunk():
+        chunk = bulk.take_chunk()
+        if chunk:
+            courses = await async_db.upsert_courses(chunk)
+            for course in courses:
+                recommendations.course_index.add_course(course)
+            bulk.saved(len(courses))
     
+    async for line_number, line in iter_ndjson_lines(request):
+        if isinstance(line, ValueError):
+            bulk.add_error(line_number, str(line))
+            continue
+        try:
+            row = course_import.parse_ndjson_line(line)
+        except ValueError as exc:
+            bulk.add_error(line_number, str(exc))
+            continue
+        if bulk.add(line_number, row):
+            await save_chunk()
+    await save_chunk()
+    
+    if bulk.imported:
+        roadmap_generator.invalidate_roadmap_plans()
+    return bulk.result()
+
+def format_gap_report(report: Dict[str, Any]) -> Dict[str, Any]:
     return {
         "id": report["id"],
         "userId": report["user_id"],
@@ -179,60 +474,115 @@ async def get_gap_report(user_id: str):
         "generatedAt": report["generated_at"]
     }
 
-@app.post("/api/roadmaps/generate")
-async def generate_roadmap(request: Dict[str, Any]):
-    """Generate roadmap for user and save to database"""
-    user_id = request.get("userId")
+@app.get("/api/gap-reports/{user_id}")
+async def get_gap_report(request: Request, response: Response, user_id: str, refresh: bool = False):
+    """Get gap report for user from database, generating it on first request"""
+    key = f"gap_report:{user_id}"
+    if not refresh:
+        not_modified, _ = await check_conditional(request, key)
+        if not_modified:
+            return not_modified
+        report, version, updated_at = await async_db.get_gap_report_versioned(user_id)
+        if report:
+            response.headers.update(validator_headers(key, version, updated_at))
+            return format_gap_report(report)
     
-    # Check if roadmap exists
-    existing_roadmap = db.get_roadmap_by_user_id(user_id)
-    if existing_roadmap:
-        return {
-            "id": existing_roadmap["id"],
-            "userId": existing_roadmap["user_id"],
-            "title": existing_roadmap["title"],
-            "status": existing_roadmap["status"],
-            "estimatedTotalHours": existing_roadmap["estimated_total_hours"],
-            "steps": existing_roadmap["steps"],
-            "createdAt": existing_roadmap["created_at"]
-        }
+    await generate_gap_report(user_id)
+    report, version, updated_at = await async_db.get_gap_report_versioned(user_id)
+    response.headers.update(validator_headers(key, version, updated_at))
+    return format_gap_report(report)
+
+async def generate_gap_report(user_id: str) -> Dict[str, Any]:
+    """Score the user's current skill levels against their target role and store the report"""
+    user = await async_db.get_user_by_id(user_id)
+    role = (user or {}).get("target_role") or DEFAULT_TARGET_ROLE
+    requirements = await async_db.get_role_requirements(role)
+    current_levels = await async_db.get_user_skill_levels(user_id)
+    readiness_score, skill_gaps = gap_engine.analyze(
+        gap_engine.RoleProfile.from_requirements(role, requirements),
+        current_levels
+    )
     
-    # Generate new roadmap
-    steps = [
-        {
-            "id": str(uuid.uuid4()),
-            "stepOrder": 1,
-            "title": "Learn Swift Basics",
-            "description": "Master Swift fundamentals",
-            "estHours": 20,
-            "status": "Pending"
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "stepOrder": 2,
-            "title": "SwiftUI Fundamentals",
-            "description": "Learn SwiftUI framework",
-            "estHours": 30,
-            "status": "Pending"
-        },
+    return await async_db.create_gap_report(
+        user_id=user_id,
+        readiness_score=readiness_score,
+        skill_gaps=skill_gaps
+    )
+
+async def load_course_index() -> recommendations.CourseIndex:
+    """The in-memory course index, loading it from the database on first use"""
+    index = recommendations.course_index
+    if not index.loaded:
+        await async_db.run(recommendations.get_course_index, db, index)
+    return index
+
+@app.get("/api/recommendations/{user_id}")
+async def get_recommendations(user_id: str, limit: int = 10):
+    """Top courses for the user's latest skill gaps"""
+    report = await async_db.get_gap_report_by_user_id(user_id)
+    if not report:
+        report = await generate_gap_report(user_id)
+    
+    index = await load_course_index()
+    results = index.recommend(report["skill_gaps"], limit=min(max(limit, 1), MAX_PAGE_SIZE))
+    return [
         {
-            "id": str(uuid.uuid4()),
-            "stepOrder": 3,
-            "title": "Combine Framework",
-            "description": "Learn reactive programming",
-            "estHours": 25,
-            "status": "Pending"
+            "course": format_course(result["course"]),
+            "score": result["score"],
+            "matchedSkills": result["matchedSkills"]
         }
+        for result in results
     ]
+
+# Latest progress of the batch gap-report recompute started from the admin endpoint
+recompute_state: Dict[str, Any] = {"running": False, "progress": None, "error": None}
+
+def run_gap_recompute(chunk_size: int, restart: bool):
+    def on_chunk(progress: Dict[str, Any]):
+        recompute_state["progress"] = progress
     
-    roadmap = db.create_roadmap(
-        user_id=user_id,
-        title="iOS Developer Roadmap",
-        status="Active",
-        estimated_total_hours=120,
-        steps=steps
-    )
+    try:
+        recompute_state["progress"] = recompute_gaps.recompute_gap_reports(
+            db, chunk_size=chunk_size, restart=restart, on_chunk=on_chunk
+        )
+    except Exception as exc:
+        recompute_state["error"] = str(exc)
+    finally:
+        recompute_state["running"] = False
+
+@app.post("/api/admin/gap-reports/recompute", status_code=202)
+async def start_gap_recompute(background_tasks: BackgroundTasks, chunk_size: int = recompute_gaps.DEFAULT_CHUNK_SIZE, restart: bool = False):
+    """Recompute every user's gap report in the background (resumes an interrupted run)"""
+    if recompute_state["running"]:
+        raise HTTPException(status_code=409, detail="Recompute already running")
+    recompute_state.update(running=True, progress=None, error=None)
+    background_tasks.add_task(run_gap_recompute, max(chunk_size, 1), restart)
+    return {"status": "started"}
+
+@app.get("/api/admin/gap-reports/recompute")
+async def get_gap_recompute_status():
+    """Progress of the batch gap-report recompute"""
+    return {
+        "running": recompute_state["running"],
+        "progress": recompute_state["progress"],
+        "error": recompute_state["error"],
+        "checkpoint": await async_db.get_job(recompute_gaps.JOB_NAME)
+    }
+
+@app.put("/api/users/{user_id}/skills")
+async def update_user_skills(user_id: str, request: Dict[str, Any]):
+    """Set current skill levels (0-100), e.g. {"skills": {"Swift": 60}}"""
+    skills = request.get("skills")
+    if not isinstance(skills, dict):
+        raise HTTPException(status_code=400, detail="skills must be an object of skill name to level")
+    try:
+        levels = {str(name): min(max(float(level), 0.0), 100.0) for name, level in skills.items()}
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Skill levels must be numbers")
     
+    return {"userId": user_id, "skills": await async_db.set_user_skill_levels(user_id, levels)}
+
+def format_roadmap(roadmap: Dict[str, Any]) -> Dict[str, Any]:
     return {
         "id": roadmap["id"],
         "userId": roadmap["user_id"],
@@ -243,23 +593,216 @@ async def generate_roadmap(request: Dict[str, Any]):
         "createdAt": roadmap["created_at"]
     }
 
+@app.get("/api/users/{user_id}/roadmap")
+async def get_user_roadmap(request: Request, response: Response, user_id: str):
+    """Latest roadmap of a user; supports If-None-Match / If-Modified-Since"""
+    key = f"roadmap:{user_id}"
+    not_modified, _ = await check_conditional(request, key)
+    if not_modified:
+        return not_modified
+    
+    roadmap, version, updated_at = await async_db.get_roadmap_versioned(user_id)
+    if not roadmap:
+        raise HTTPException(status_code=404, detail="Roadmap not found")
+    
+    response.headers.update(validator_headers(key, version, updated_at))
+    return format_roadmap(roadmap)
+
+@app.post("/api/roadmaps/generate")
+async def generate_roadmap(request: Dict[str, Any]):
+    """Generate roadmap for user and save to database"""
+    user_id = request.get("userId")
+    
+    # Check if roadmap exists
+    existing_roadmap = await async_db.get_roadmap_by_user_id(user_id)
+    if existing_roadmap and not request.get("regenerate"):
+        return format_roadmap(existing_roadmap)
+    
+    return format_roadmap(await build_roadmap(user_id))
+
+async def build_roadmap(user_id: str, report: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Order the user's gap skills along the prerequisite graph and store the roadmap"""
+    if not report:
+        report = await async_db.get_gap_report_by_user_id(user_id)
+    if not report:
+        report = await generate_gap_report(user_id)
+    user = await async_db.get_user_by_id(user_id)
+    role = (user or {}).get("target_role") or DEFAULT_TARGET_ROLE
+    
+    course_index = await load_course_index()
+    generator = await async_db.run(roadmap_generator.get_roadmap_generator, db, course_index)
+    steps, total_hours = generator.generate(role, report["skill_gaps"])
+    
+    return await async_db.create_roadmap(
+        user_id=user_id,
+        title=f"{role} Roadmap",
+        status="Active",
+        estimated_total_hours=total_hours,
+        steps=steps
+    )
+
 @app.put("/api/roadmaps/{roadmap_id}/steps/{step_id}")
 async def update_roadmap_step(roadmap_id: str, step_id: str, request: Dict[str, Any]):
-    """Update roadmap step status"""
+    """Update roadmap step status; pass "version" to reject stale updates with 409"""
     status = request.get("status", "Pending")
-    roadmap = db.update_roadmap_step(roadmap_id, step_id, status)
+    expected_version = request.get("version")
+    if expected_version is not None and (not isinstance(expected_version, int) or isinstance(expected_version, bool)):
+        raise HTTPException(status_code=400, detail="version must be an integer")
+    try:
+        roadmap = await async_db.update_roadmap_step(roadmap_id, step_id, status, expected_version=expected_version)
+    except VersionConflictError as exc:
+        raise HTTPException(status_code=409, detail=f"Step was modified concurrently (current version {exc.current_version})")
     
     if not roadmap:
-        raise HTTPException(status_code=404, detail="Roadmap not found")
+        raise HTTPException(status_code=404, detail="Roadmap step not found")
+    
+    return format_roadmap(roadmap)
+
+DASHBOARD_COURSE_FIELDS = ["id", "title", "provider", "level", "rating"]
+
+@app.get("/api/dashboard/{user_id}")
+async def get_dashboard(user_id: str, courses: int = 5):
+    """User, gap report, roadmap and top course picks for the dashboard in one round trip.
+
+    The user's rows are read on one connection in one read transaction while
+    the course index loads alongside it. A missing gap report or roadmap is
+    generated, exactly as the separate endpoints would do.
+    """
+    snapshot, index = await asyncio.gather(async_db.get_dashboard(user_id), load_course_index())
+    user = snapshot["user"]
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    report = snapshot["gap_report"] or await generate_gap_report(user_id)
+    roadmap = snapshot["roadmap"] or await build_roadmap(user_id, report)
+    picks = index.recommend(report["skill_gaps"], limit=min(courses, MAX_PAGE_SIZE)) if courses > 0 else []
     
     return {
-        "id": roadmap["id"],
-        "userId": roadmap["user_id"],
-        "title": roadmap["title"],
-        "status": roadmap["status"],
-        "estimatedTotalHours": roadmap["estimated_total_hours"],
-        "steps": roadmap["steps"],
-        "createdAt": roadmap["created_at"]
+        "user": format_user(user),
+        "gapReport": format_gap_report(report),
+        "roadmap": format_roadmap(roadmap),
+        "courses": [
+            {**format_course(pick["course"], DASHBOARD_COURSE_FIELDS), "matchedSkills": pick["matchedSkills"]}
+            for pick in picks
+        ]
+    }
+
+def encode_sync_token(seq: int) -> str:
+    return encode_cursor(str(seq))
+
+def decode_sync_token(token: str) -> int:
+    try:
+        return int(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid sync token")
+
+@app.get("/api/sync")
+async def sync(user_id: str, since: Optional[str] = None):
+    """Everything the app shows for a user that changed after the ``since`` token.
+
+    The first call (no token) returns a full snapshot; later calls return
+    only changed rows plus a new token. ``full`` tells the client whether to
+    replace its local data or merge the delta into it.
+    """
+    changes = await async_db.get_changes_since(user_id, decode_sync_token(since) if since else None)
+    user = changes["user"]
+    return FastJSONResponse({
+        "token": encode_sync_token(changes["seq"]),
+        "full": changes["full"],
+        "user": {
+            "id": user["id"],
+            "email": user["email"],
+            "name": user["name"],
+            "role": user["role"],
+            "targetRole": user["target_role"],
+            "skills": user["skills"]
+        } if user else None,
+        "courses": changes["courses"],
+        "gapReport": format_gap_report(changes["gap_report"]) if changes["gap_report"] else None,
+        "roadmap": format_roadmap(changes["roadmap"]) if changes["roadmap"] else None
+    })
+
+def format_curriculum(curriculum: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": curriculum["id"],
+        "userId": curriculum["user_id"],
+        "title": curriculum["title"],
+        "status": curriculum["status"],
+        "source": curriculum["source"],
+        "error": curriculum["error"],
+        "modules": [
+            {
+                "id": module["id"],
+                "title": module["title"],
+                "description": module["description"] or "",
+                "hoursEstimate": module["hours_estimate"] or 0,
+                "orderIdx": module["order_idx"]
+            }
+            for module in curriculum["modules"]
+        ],
+        "createdAt": curriculum["created_at"]
+    }
+
+async def save_upload(request: Request, path: str) -> int:
+    """Write the request body to ``path`` chunk by chunk; returns its size"""
+    size = 0
+    file = await asyncio.to_thread(open, path, "wb")
+    try:
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > curricula.MAX_UPLOAD_BYTES:
+                raise HTTPException(status_code=413, detail=f"Curriculum file is larger than {curricula.MAX_UPLOAD_BYTES // (1024 * 1024)} MB")
+            if chunk:
+                await asyncio.to_thread(file.write, chunk)
+    except BaseException:
+        await asyncio.to_thread(file.close)
+        await asyncio.to_thread(os.remove, path)
+        raise
+    await asyncio.to_thread(file.close)
+    return size
+
+@app.post("/api/curricula/upload", status_code=202)
+async def upload_curriculum(request: Request, title: Optional[str] = None, user_id: Optional[str] = None):
+    """Upload a syllabus as the raw request body (text or Markdown).
+
+    The body is streamed to disk and parsed in the background; poll
+    GET /api/curricula/{id} until the status is Completed or Failed.
+    """
+    await asyncio.to_thread(os.makedirs, curricula.UPLOAD_DIR, exist_ok=True)
+    path = os.path.join(curricula.UPLOAD_DIR, f"{uuid.uuid4()}.upload")
+    size = await save_upload(request, path)
+    if size == 0:
+        await asyncio.to_thread(os.remove, path)
+        raise HTTPException(status_code=400, detail="Curriculum file is empty")
+    
+    curriculum = await async_db.create_curriculum(
+        title or request.headers.get("x-filename") or "Uploaded curriculum", path, size, user_id=user_id
+    )
+    curriculum_processor.submit(curriculum["id"], path)
+    return format_curriculum(curriculum)
+
+@app.get("/api/curricula/{curriculum_id}")
+async def get_curriculum(curriculum_id: str):
+    """Curriculum with its parsing status and, once Completed, its modules"""
+    curriculum = await async_db.get_curriculum(curriculum_id)
+    if not curriculum:
+        raise HTTPException(status_code=404, detail="Curriculum not found")
+    return format_curriculum(curriculum)
+
+@app.get("/api/curricula/{curriculum_id}/skills")
+async def get_curriculum_skills(curriculum_id: str):
+    """Skills found in a curriculum's modules, most mentioned first"""
+    curriculum = await async_db.get_curriculum(curriculum_id, with_modules=False)
+    if not curriculum:
+        raise HTTPException(status_code=404, detail="Curriculum not found")
+    skills = await async_db.get_curriculum_skills(curriculum_id)
+    return {
+        "curriculumId": curriculum_id,
+        "status": curriculum["status"],
+        "skills": [
+            {"skillName": skill["skill"], "mentions": skill["mentions"], "modules": skill["modules"]}
+            for skill in skills
+        ]
     }
 
 if __name__ == "__main__":
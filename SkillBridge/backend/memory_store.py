@@ -0,0 +1,86 @@
+"""
+In-memory storage for the database-free variants (main.py, main_simple.py)
+
+Users are kept as __slots__ records with a secondary hash index on email,
+so auth lookups are O(1). Every repository guards its state with a lock,
+which makes it safe to use from sync handlers running in a thread pool.
+"""
+
+import threading
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+
+class UserExistsError(Exception):
+    """Raised when registering an email that is already taken"""
+
+
+class UserRecord:
+    __slots__ = ("id", "email", "name", "role")
+
+    def __init__(self, id: str, email: str, name: str, role: str = "student"):
+        self.id = id
+        self.email = email
+        self.name = name
+        self.role = role
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"id": self.id, "email": self.email, "name": self.name, "role": self.role}
+
+
+class UserRepository:
+    """Users by id with an email index; remembers the first user for the demo /users/me"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_id: Dict[str, UserRecord] = {}
+        self._id_by_email: Dict[str, str] = {}
+        self._first_id: Optional[str] = None
+
+    def create(self, email: str, name: str, role: str = "student", user_id: Optional[str] = None) -> UserRecord:
+        """Add a user; raises UserExistsError if the email is taken"""
+        with self._lock:
+            if email in self._id_by_email:
+                raise UserExistsError(email)
+            user = UserRecord(user_id or str(uuid.uuid4()), email, name, role)
+            self._by_id[user.id] = user
+            self._id_by_email[email] = user.id
+            if self._first_id is None:
+                self._first_id = user.id
+            return user
+
+    def get(self, user_id: str) -> Optional[UserRecord]:
+        with self._lock:
+            return self._by_id.get(user_id)
+
+    def get_by_email(self, email: str) -> Optional[UserRecord]:
+        with self._lock:
+            user_id = self._id_by_email.get(email)
+            return self._by_id[user_id] if user_id else None
+
+    def first(self) -> Optional[UserRecord]:
+        with self._lock:
+            return self._by_id.get(self._first_id) if self._first_id else None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._by_id)
+
+
+class KeyedStore:
+    """Thread-safe dict of per-user documents (gap reports, roadmaps)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._items: Dict[str, Any] = {}
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            return self._items.get(key)
+
+    def get_or_create(self, key: str, factory: Callable[[], Any]) -> Any:
+        """Existing value for ``key``, or the result of ``factory`` stored atomically"""
+        with self._lock:
+            if key not in self._items:
+                self._items[key] = factory()
+            return self._items[key]
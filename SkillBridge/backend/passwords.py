@@ -0,0 +1,155 @@
+"""
+Password hashing with scrypt on a bounded worker pool
+
+Hashes are stored as "scrypt$<n>$<r>$<p>$<salt>$<key>" so the cost can be
+raised later without breaking existing hashes: verification reads the
+parameters from the stored value, and needs_rehash() tells login to
+upgrade hashes made with an older cost.
+
+scrypt is deliberately slow (~50 ms at the default cost), so handlers
+never call it inline. PasswordHasher runs it on a few threads (OpenSSL
+releases the GIL while it works) and lets at most ``max_pending`` more
+requests wait; beyond that it raises PasswordHasherBusyError so a login
+burst gets 503s instead of an ever-growing queue. Cost and pool size are
+configurable through the environment:
+
+    SKILLBRIDGE_SCRYPT_N        CPU/memory cost, a power of two (default 16384)
+    SKILLBRIDGE_HASH_WORKERS    hashing threads (default: half the CPUs)
+
+Accounts created before passwords were stored have no hash and cannot sign
+in until a password is set for them:
+
+    python passwords.py student@iitu.kz [--db skillbridge.db]
+"""
+
+import argparse
+import asyncio
+import base64
+import getpass
+import hashlib
+import hmac
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+SCRYPT_N = int(os.environ.get("SKILLBRIDGE_SCRYPT_N", 2 ** 14))
+SCRYPT_R = 8
+SCRYPT_P = 1
+SALT_BYTES = 16
+KEY_BYTES = 32
+MIN_PASSWORD_LENGTH = 8
+
+
+class PasswordHasherBusyError(Exception):
+    """Raised when too many password hashes are already waiting for a worker"""
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _unb64(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    # scrypt needs 128 * n * r bytes; leave headroom over OpenSSL's 32 MB default
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, maxmem=256 * n * r, dklen=KEY_BYTES)
+
+
+def hash_password(password: str, n: int = SCRYPT_N) -> str:
+    """Salted scrypt hash of ``password`` in the stored format"""
+    salt = os.urandom(SALT_BYTES)
+    key = _scrypt(password, salt, n, SCRYPT_R, SCRYPT_P)
+    return f"scrypt${n}${SCRYPT_R}${SCRYPT_P}${_b64(salt)}${_b64(key)}"
+
+
+def verify_password(password: str, stored: str) -> bool:
+    """Whether ``password`` matches a stored hash (False for malformed hashes)"""
+    try:
+        scheme, n, r, p, salt, key = stored.split("$")
+        if scheme != "scrypt":
+            return False
+        expected = _unb64(key)
+        return hmac.compare_digest(_scrypt(password, _unb64(salt), int(n), int(r), int(p)), expected)
+    except ValueError:
+        return False
+
+
+def needs_rehash(stored: str, n: int = SCRYPT_N) -> bool:
+    """Whether a stored hash was made with parameters other than the current ones"""
+    return not stored.startswith(f"scrypt${n}${SCRYPT_R}${SCRYPT_P}$")
+
+
+class PasswordHasher:
+    """Async front end for hash_password / verify_password on a dedicated pool"""
+
+    def __init__(self, max_workers: Optional[int] = None, max_pending: int = 128):
+        self.max_workers = max_workers or int(os.environ.get("SKILLBRIDGE_HASH_WORKERS", 0)) or max(1, (os.cpu_count() or 2) // 2)
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="passwords")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._completed = 0
+        self._rejected = 0
+
+    async def _run(self, func, *args) -> Any:
+        with self._lock:
+            if self._queued >= self.max_workers + self.max_pending:
+                self._rejected += 1
+                raise PasswordHasherBusyError(f"{self._queued} password hashes already queued")
+            self._queued += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            with self._lock:
+                self._queued -= 1
+                self._completed += 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def verify(self, password: str, stored: str) -> bool:
+        return await self._run(verify_password, password, stored)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "queued": self._queued,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "scrypt_n": SCRYPT_N
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Set a user's password")
+    parser.add_argument("email", help="Email of the user")
+    parser.add_argument("--db", default="skillbridge.db", help="SQLite database path")
+    args = parser.parse_args()
+
+    # Imported here: database.py imports this module
+    from database import Database
+    database = Database(args.db)
+    user = database.get_user_by_email(args.email)
+    if not user:
+        sys.exit(f"❌ No user with email {args.email}")
+
+    password = getpass.getpass("New password: ")
+    if len(password) < MIN_PASSWORD_LENGTH:
+        sys.exit(f"❌ Password must be at least {MIN_PASSWORD_LENGTH} characters")
+    if getpass.getpass("Repeat password: ") != password:
+        sys.exit("❌ Passwords do not match")
+    database.set_password_hash(user["id"], hash_password(password))
+    print(f"✅ Password set for {user['email']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Course recommendations for skill gaps
+
+Keeps an in-memory inverted index skill -> {course_id: weight} so a user's
+gaps only touch the courses that teach those skills. The index is built
+once from the database and updated incrementally as courses are created.
+"""
+
+import heapq
+import math
+import threading
+from typing import List, Dict, Any, Optional, Iterable
+
+from database import Database
+
+PRIORITY_WEIGHTS = {"High": 3.0, "Medium": 2.0, "Low": 1.0}
+LEVELS = ["Beginner", "Intermediate", "Advanced"]
+
+
+def level_for(current_level: float) -> str:
+    """Course level that fits a current skill level (0-100)"""
+    if current_level < 34:
+        return "Beginner"
+    if current_level < 67:
+        return "Intermediate"
+    return "Advanced"
+
+
+class CourseIndex:
+    """Weighted skill -> course postings plus the course fields used for ranking"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._courses: Dict[str, Dict[str, Any]] = {}
+        self.loaded = False
+
+    def load(self, courses: Iterable[Dict[str, Any]]):
+        """Rebuild the index from course rows"""
+        with self._lock:
+            self._postings.clear()
+            self._courses.clear()
+            for course in courses:
+                self.add_course(course)
+            self.loaded = True
+
+    def add_course(self, course: Dict[str, Any]):
+        """Index (or re-index) a single course row"""
+        with self._lock:
+            self.remove_course(course["id"])
+            skills = {name.strip().lower() for name in course.get("skills") or [] if name and name.strip()}
+            if not skills:
+                return
+            self._courses[course["id"]] = course
+            # Courses focused on fewer skills weigh more for each of them
+            weight = 1.0 / math.sqrt(len(skills))
+            for skill in skills:
+                self._postings.setdefault(skill, {})[course["id"]] = weight
+
+    def remove_course(self, course_id: str):
+        with self._lock:
+            course = self._courses.pop(course_id, None)
+            if course is None:
+                return
+            for name in course.get("skills") or []:
+                postings = self._postings.get(name.strip().lower())
+                if postings:
+                    postings.pop(course_id, None)
+
+    def recommend(self, skill_gaps: List[Dict[str, Any]], limit: int = 10) -> List[Dict[str, Any]]:
+        """Top courses for the given SkillGap dicts, best first"""
+        with self._lock:
+            scores: Dict[str, float] = {}
+            matched: Dict[str, List[str]] = {}
+            for gap in skill_gaps:
+                postings = self._postings.get(gap["skillName"].lower())
+                if not postings:
+                    continue
+                gap_size = max(gap["requiredLevel"] - gap["currentLevel"], 0.0) / 100.0
+                gap_weight = PRIORITY_WEIGHTS.get(gap.get("priority"), 1.0) * (0.5 + gap_size)
+                wanted_level = LEVELS.index(level_for(gap["currentLevel"]))
+                for course_id, weight in postings.items():
+                    course = self._courses[course_id]
+                    level = course.get("level")
+                    distance = abs(LEVELS.index(level) - wanted_level) if level in LEVELS else 1
+                    level_fit = (1.0, 0.7, 0.4)[distance]
+                    scores[course_id] = scores.get(course_id, 0.0) + gap_weight * weight * level_fit
+                    matched.setdefault(course_id, []).append(gap["skillName"])
+
+            ranked = heapq.nlargest(
+                limit,
+                ((self._adjust(self._courses[course_id], score), course_id) for course_id, score in scores.items())
+            )
+            return [
+                {"course": self._courses[course_id], "score": round(score, 4), "matchedSkills": matched[course_id]}
+                for score, course_id in ranked
+            ]
+
+    @staticmethod
+    def _adjust(course: Dict[str, Any], score: float) -> float:
+        """Favor well-rated and cheaper courses"""
+        rating = course.get("rating") or 3.0
+        price = course.get("price") or 0.0
+        return score * (0.5 + rating / 10.0) / (1.0 + price / 100.0)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"courses": len(self._courses), "skills": len(self._postings)}
+
+
+# Global course index, loaded on first use
+course_index = CourseIndex()
+
+
+def get_course_index(database: Database, index: Optional[CourseIndex] = None) -> CourseIndex:
+    """Return the index, loading it from the database if needed"""
+    index = index or course_index
+    if not index.loaded:
+        index.load(database.get_all_courses())
+    return index
@@ -0,0 +1,100 @@
+"""
+Batch recomputation of gap reports for every user
+
+Run after a role's requirements or the skills taxonomy change:
+
+    python recompute_gaps.py [--chunk-size 1000] [--restart]
+
+Users are processed in id order, one chunk per transaction. Progress is
+checkpointed in job_checkpoints with each chunk, so an interrupted run
+continues where it stopped unless --restart is given.
+"""
+
+import argparse
+import time
+from typing import Any, Callable, Dict, Optional
+
+import gap_engine
+from database import Database, DEFAULT_TARGET_ROLE
+
+JOB_NAME = "recompute_gap_reports"
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def recompute_gap_reports(
+    database: Database,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    restart: bool = False,
+    on_chunk: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    """Score every user against their target role and store fresh gap reports"""
+    checkpoint = database.start_job(JOB_NAME, restart=restart)
+    after_id = checkpoint["last_key"]
+    resumed_from = checkpoint["processed"]
+    profiles: Dict[str, gap_engine.RoleProfile] = {}
+
+    processed = 0
+    started = time.perf_counter()
+    while True:
+        users = database.get_users_after(after_id, chunk_size)
+        if not users:
+            break
+
+        levels = database.get_skill_levels_for_users([user["id"] for user in users])
+
+        # Score each target role's users as one matrix
+        by_role: Dict[str, list] = {}
+        for user in users:
+            by_role.setdefault(user["target_role"] or DEFAULT_TARGET_ROLE, []).append(user["id"])
+
+        reports = []
+        for role, user_ids in by_role.items():
+            if role not in profiles:
+                profiles[role] = gap_engine.RoleProfile.from_requirements(role, database.get_role_requirements(role))
+            profile = profiles[role]
+            scores = gap_engine.score(profile, profile.level_matrix([levels[user_id] for user_id in user_ids]))
+            for row, user_id in enumerate(user_ids):
+                reports.append((user_id, float(scores.readiness[row]), gap_engine.skill_gaps(profile, scores, row)))
+
+        after_id = users[-1]["id"]
+        database.save_gap_reports(reports, checkpoint=(JOB_NAME, after_id, len(users)))
+        processed += len(users)
+
+        if on_chunk:
+            on_chunk(_progress(processed, resumed_from, started))
+
+    database.finish_job(JOB_NAME)
+    return _progress(processed, resumed_from, started)
+
+
+def _progress(processed: int, resumed_from: int, started: float) -> Dict[str, Any]:
+    elapsed = time.perf_counter() - started
+    return {
+        "processed": processed,
+        "resumedFrom": resumed_from,
+        "elapsedSeconds": round(elapsed, 3),
+        "usersPerSecond": round(processed / elapsed, 1) if elapsed > 0 else 0.0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute gap reports for all users")
+    parser.add_argument("--db", default="skillbridge.db", help="SQLite database path")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Users per transaction")
+    parser.add_argument("--restart", action="store_true", help="Ignore the saved checkpoint and start over")
+    args = parser.parse_args()
+
+    database = Database(args.db)
+
+    def report(progress: Dict[str, Any]):
+        print(f"   {progress['processed']} users, {progress['usersPerSecond']} users/s")
+
+    print("🔄 Recomputing gap reports...")
+    result = recompute_gap_reports(database, chunk_size=args.chunk_size, restart=args.restart, on_chunk=report)
+    if result["resumedFrom"]:
+        print(f"   Resumed after {result['resumedFrom']} users")
+    print(f"✅ Done: {result['processed']} users in {result['elapsedSeconds']}s ({result['usersPerSecond']} users/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Roadmap generation from skill gaps
+
+Gap skills are ordered along a skill prerequisite DAG (prerequisites
+first, higher priority first among ready skills) and each step gets the
+best matching course. Step order and course picks depend only on the
+role and the gaps' skill, priority and level band, so those plans are
+cached per (role, gap signature) and reused by every user with a similar
+profile. Anything quoting a user's exact levels is filled in per request.
+"""
+
+import heapq
+import threading
+import uuid
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Set, Tuple
+
+from recommendations import LEVELS, CourseIndex, level_for
+
+HOURS_PER_COURSE_WEEK = 5
+HOURS_BY_PRIORITY = {"High": 30, "Medium": 20, "Low": 10}
+PRIORITY_RANK = {"High": 0, "Medium": 1, "Low": 2}
+
+
+class SkillGraph:
+    """Skill prerequisite DAG keyed by lowercase skill name"""
+
+    def __init__(self, prerequisites: Dict[str, List[str]]):
+        self._prerequisites: Dict[str, Set[str]] = {}
+        for skill, required in prerequisites.items():
+            self._prerequisites.setdefault(skill.lower(), set()).update(name.lower() for name in required)
+
+    def order(self, skills: List[str], rank: Dict[str, Tuple]) -> List[str]:
+        """Topologically order ``skills`` so prerequisites come first.
+
+        Dependencies through skills outside the list still count (if A needs
+        B and B needs C, C comes before A). Among skills that are ready,
+        the lowest ``rank`` goes first. Skills caught in a cycle are appended
+        in rank order rather than dropped.
+        """
+        wanted = {skill.lower(): skill for skill in skills}
+
+        def wanted_prerequisites(skill: str) -> Set[str]:
+            # Nearest prerequisites that are themselves wanted, walking through the rest
+            found: Set[str] = set()
+            seen: Set[str] = set()
+            stack = list(self._prerequisites.get(skill, ()))
+            while stack:
+                required = stack.pop()
+                if required in seen:
+                    continue
+                seen.add(required)
+                if required in wanted:
+                    found.add(required)
+                else:
+                    stack.extend(self._prerequisites.get(required, ()))
+            found.discard(skill)
+            return found
+
+        depends_on = {key: wanted_prerequisites(key) for key in wanted}
+        dependents: Dict[str, List[str]] = {key: [] for key in wanted}
+        for key, required in depends_on.items():
+            for prerequisite in required:
+                dependents[prerequisite].append(key)
+
+        remaining = {key: len(required) for key, required in depends_on.items()}
+        ready = [(rank[wanted[key]], key) for key, count in remaining.items() if count == 0]
+        heapq.heapify(ready)
+
+        ordered: List[str] = []
+        while ready:
+            _, key = heapq.heappop(ready)
+            ordered.append(wanted[key])
+            for dependent in dependents[key]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    heapq.heappush(ready, (rank[wanted[dependent]], dependent))
+
+        if len(ordered) < len(wanted):
+            placed = set(ordered)
+            ordered.extend(sorted((skill for skill in wanted.values() if skill not in placed), key=lambda skill: rank[skill]))
+        return ordered
+
+
+class RoadmapGenerator:
+    """Builds roadmap steps from skill gaps with an LRU cache of plans"""
+
+    def __init__(self, graph: SkillGraph, course_index: CourseIndex, cache_size: int = 256):
+        self.graph = graph
+        self.course_index = course_index
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple, List[Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def signature(skill_gaps: List[Dict[str, Any]]) -> Tuple:
+        """Everything about the gaps that affects the plan"""
+        return tuple(sorted(
+            (gap["skillName"].lower(), gap.get("priority", "Medium"), level_for(gap["currentLevel"]))
+            for gap in skill_gaps
+        ))
+
+    def plan(self, role: str, skill_gaps: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Ordered step templates (without ids or status) for a role and its gaps.
+
+        Templates are shared between users with the same signature, so they
+        hold nothing finer than the level band: steps without a course have
+        ``description`` None, which generate() fills in from the exact levels.
+        """
+        key = (role, self.signature(skill_gaps))
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        gaps_by_skill = {gap["skillName"]: gap for gap in skill_gaps}
+        # Higher priority first, then the lower level band (the wider gap)
+        rank = {
+            name: (PRIORITY_RANK.get(gap.get("priority"), 1), LEVELS.index(level_for(gap["currentLevel"])), name.lower())
+            for name, gap in gaps_by_skill.items()
+        }
+
+        templates = []
+        for skill in self.graph.order(list(gaps_by_skill), rank):
+            gap = gaps_by_skill[skill]
+            best = self.course_index.recommend([gap], limit=1)
+            course = best[0]["course"] if best else None
+            if course:
+                hours = max(int(course.get("duration_weeks") or 0) * HOURS_PER_COURSE_WEEK, 1)
+                description = f"Take \"{course['title']}\" ({course['provider']})"
+            else:
+                hours = HOURS_BY_PRIORITY.get(gap.get("priority"), 20)
+                description = None
+            templates.append({
+                "title": f"Learn {skill}",
+                "description": description,
+                "skillName": skill,
+                "courseId": course["id"] if course else None,
+                "estHours": hours
+            })
+
+        with self._lock:
+            self._cache[key] = templates
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return templates
+
+    def generate(self, role: str, skill_gaps: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+        """Fresh roadmap steps and their total hours"""
+        gaps_by_skill = {gap["skillName"].lower(): gap for gap in skill_gaps}
+        steps = []
+        for order, template in enumerate(self.plan(role, skill_gaps), start=1):
+            step = {"id": str(uuid.uuid4()), "stepOrder": order, **template, "status": "Pending"}
+            if step["description"] is None:
+                gap = gaps_by_skill[step["skillName"].lower()]
+                step["description"] = f"Raise {gap['skillName']} from {gap['currentLevel']:.0f} to {gap['requiredLevel']:.0f}"
+            steps.append(step)
+        return steps, sum(step["estHours"] for step in steps)
+
+    def invalidate(self):
+        """Drop cached plans, e.g. after the course catalog or skill graph changes"""
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"cached": len(self._cache), "hits": self.hits, "misses": self.misses}
+
+
+# Global generator, created on first use
+_generator: Optional[RoadmapGenerator] = None
+_generator_lock = threading.Lock()
+
+
+def get_roadmap_generator(database, course_index: CourseIndex) -> RoadmapGenerator:
+    """Return the generator, loading the skill graph from the database if needed"""
+    global _generator
+    with _generator_lock:
+        if _generator is None:
+            _generator = RoadmapGenerator(SkillGraph(database.get_skill_prerequisites()), course_index)
+        return _generator
+
+
+def invalidate_roadmap_plans():
+    """Drop cached plans of the global generator, if it exists"""
+    with _generator_lock:
+        if _generator is not None:
+            _generator.invalidate()
@@ -0,0 +1,95 @@
+"""
+Fast JSON serialization for API payloads
+
+Course queries alias columns to the iOS field names in SQL
+(``duration_weeks AS durationWeeks``) and turn each row tuple into a
+payload dict with an encoder compiled once per field list, so handlers no
+longer rebuild every row by hand. Responses are rendered with orjson when
+it is installed, skipping FastAPI's generic ``jsonable_encoder``.
+"""
+
+import json
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
+
+# iOS field name -> courses column
+COURSE_FIELDS = {
+    "id": "id",
+    "title": "title",
+    "provider": "provider",
+    "description": "description",
+    "durationWeeks": "duration_weeks",
+    "price": "price",
+    "level": "level",
+    "skills": "skills",
+    "url": "url",
+    "rating": "rating"
+}
+
+# Fields stored as JSON text
+JSON_FIELDS = {"skills"}
+
+if orjson is not None:
+    def dumps(value: Any) -> bytes:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+    loads = orjson.loads
+else:
+    def dumps(value: Any) -> bytes:
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str).encode()
+
+    loads = json.loads
+
+
+class FastJSONResponse(Response):
+    """JSON response rendered with orjson (stdlib json if orjson is missing)"""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def course_select(fields: Optional[Sequence[str]] = None, table: str = "c") -> Tuple[str, Tuple[str, ...]]:
+    """Aliased SELECT list for ``fields`` (all fields by default) and the payload keys in order.
+
+    ``id`` is always selected, last if it was not requested, so keyset
+    pagination can continue from the final row.
+    """
+    keys = tuple(fields or COURSE_FIELDS)
+    unknown = [key for key in keys if key not in COURSE_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown course fields: {', '.join(unknown)}")
+    selected = keys if "id" in keys else keys + ("id",)
+    return ", ".join(f"{table}.{COURSE_FIELDS[key]} AS {key}" for key in selected), keys
+
+
+@lru_cache(maxsize=64)
+def row_encoder(keys: Tuple[str, ...]) -> Callable[[Sequence[Any]], Dict[str, Any]]:
+    """Compiled row tuple -> payload dict converter for a fixed key order"""
+    json_positions = [position for position, key in enumerate(keys) if key in JSON_FIELDS]
+    width = len(keys)
+
+    if not json_positions:
+        def encode(row: Sequence[Any]) -> Dict[str, Any]:
+            return dict(zip(keys, row[:width]))
+        return encode
+
+    def encode(row: Sequence[Any]) -> Dict[str, Any]:
+        values = list(row[:width])
+        for position in json_positions:
+            values[position] = loads(values[position]) if values[position] else []
+        return dict(zip(keys, values))
+    return encode
+
+
+def encode_rows(rows: List[Sequence[Any]], keys: Tuple[str, ...]) -> List[Dict[str, Any]]:
+    encode = row_encoder(keys)
+    return [encode(row) for row in rows]
@@ -0,0 +1,210 @@
+"""
+Skill extraction from curriculum text
+
+Maps module titles and descriptions onto the skills vocabulary (skill
+names plus skill_aliases) with an Aho-Corasick automaton, so each text is
+scanned once however many skills there are. Matches must sit on word
+boundaries ("Git" does not match "digital", "Swift" does not match
+"SwiftUI") and overlapping matches keep the longest term.
+
+Re-run over every completed curriculum after the vocabulary changes:
+
+    python skill_extraction.py [--workers 4]
+
+The server scans each upload in its worker thread (extract_module_skills).
+Only the re-run above uses extract_batch, which splits batches of
+PROCESS_POOL_MIN_MODULES modules or more across a process pool: forking
+from the multithreaded server process is not safe, a standalone CLI is.
+"""
+
+import argparse
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from database import Database
+
+PROCESS_POOL_MIN_MODULES = 5000
+PROCESS_CHUNK_SIZE = 1000
+
+# (module_id, text) in, (module_id, skill name, mentions) out
+ModuleText = Tuple[str, str]
+SkillMatch = Tuple[str, str, int]
+
+
+class SkillMatcher:
+    """Aho-Corasick automaton over lowercased skill names and aliases.
+
+    Failure links are folded into the transition table when it is built,
+    so scanning costs one dict lookup per character and never backtracks.
+    """
+
+    def __init__(self, vocabulary: Dict[str, List[str]]):
+        self.vocabulary = vocabulary
+        terms: Dict[str, str] = {}
+        for skill, aliases in vocabulary.items():
+            for term in (skill, *aliases):
+                term = term.strip().lower()
+                if term:
+                    terms.setdefault(term, skill)
+
+        # Trie: transitions per state, and (term length, skill) outputs per state
+        self._delta: List[Dict[str, int]] = [{}]
+        self._outputs: List[List[Tuple[int, str]]] = [[]]
+        for term, skill in terms.items():
+            state = 0
+            for char in term:
+                next_state = self._delta[state].get(char)
+                if next_state is None:
+                    next_state = len(self._delta)
+                    self._delta[state][char] = next_state
+                    self._delta.append({})
+                    self._outputs.append([])
+                state = next_state
+            self._outputs[state].append((len(term), skill))
+
+        # Breadth-first: a state's failure target is shallower, so its row is complete
+        fail = [0] * len(self._delta)
+        children = [dict(row) for row in self._delta]
+        pending = deque(children[0].values())
+        while pending:
+            state = pending.popleft()
+            for char, child in children[state].items():
+                fail[child] = self._delta[fail[state]].get(char, 0) if state else 0
+                self._outputs[child] = self._outputs[child] + self._outputs[fail[child]]
+                pending.append(child)
+            if state:
+                for char, target in self._delta[fail[state]].items():
+                    self._delta[state].setdefault(char, target)
+
+    def find(self, text: str) -> List[Tuple[int, int, str]]:
+        """Non-overlapping ``(start, end, skill)`` matches, longest term first on overlap"""
+        text = text.lower()
+        delta = self._delta
+        outputs = self._outputs
+        length = len(text)
+        found = []
+        state = 0
+        for end, char in enumerate(text, 1):
+            state = delta[state].get(char, 0)
+            if outputs[state]:
+                for term_length, skill in outputs[state]:
+                    start = end - term_length
+                    if (start == 0 or not text[start - 1].isalnum()) and (end == length or not text[end].isalnum()):
+                        found.append((start, end, skill))
+        if len(found) < 2:
+            return found
+
+        found.sort(key=lambda match: (match[0], match[0] - match[1]))
+        kept = []
+        covered = 0
+        for match in found:
+            if match[0] >= covered:
+                kept.append(match)
+                covered = match[1]
+        return kept
+
+    def count(self, text: str) -> Dict[str, int]:
+        """Mentions per skill in ``text``"""
+        counts: Dict[str, int] = {}
+        for _, _, skill in self.find(text):
+            counts[skill] = counts.get(skill, 0) + 1
+        return counts
+
+
+def extract_module_skills(modules: List[ModuleText], matcher: SkillMatcher) -> List[SkillMatch]:
+    """Skill mentions for each module, scanned in this thread"""
+    return [
+        (module_id, skill, mentions)
+        for module_id, text in modules
+        for skill, mentions in matcher.count(text).items()
+    ]
+
+
+# Matcher of the current process-pool worker, built once by _init_worker
+_worker_matcher: Optional[SkillMatcher] = None
+
+
+def _init_worker(vocabulary: Dict[str, List[str]]):
+    global _worker_matcher
+    _worker_matcher = SkillMatcher(vocabulary)
+
+
+def _extract_chunk(modules: List[ModuleText]) -> List[SkillMatch]:
+    return extract_module_skills(modules, _worker_matcher)
+
+
+def extract_batch(modules: List[ModuleText], matcher: SkillMatcher, workers: Optional[int] = None) -> List[SkillMatch]:
+    """Skill mentions for a batch of modules, on a process pool if the batch is large.
+
+    For the CLI only; server code calls extract_module_skills().
+    """
+    if len(modules) < PROCESS_POOL_MIN_MODULES:
+        return extract_module_skills(modules, matcher)
+
+    chunks = [modules[i:i + PROCESS_CHUNK_SIZE] for i in range(0, len(modules), PROCESS_CHUNK_SIZE)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(matcher.vocabulary,)) as pool:
+        return [match for part in pool.map(_extract_chunk, chunks) for match in part]
+
+
+def module_text(module: Dict[str, str]) -> str:
+    return f"{module.get('title', '')}\n{module.get('description') or ''}"
+
+
+# Matcher over the current vocabulary, rebuilt when skills or aliases change
+_matcher: Optional[SkillMatcher] = None
+_matcher_lock = threading.Lock()
+
+
+def get_skill_matcher(database: Database) -> SkillMatcher:
+    """Return the matcher, rebuilding it if the vocabulary in the database changed"""
+    global _matcher
+    vocabulary = database.get_skill_vocabulary()
+    with _matcher_lock:
+        if _matcher is None or _matcher.vocabulary != vocabulary:
+            _matcher = SkillMatcher(vocabulary)
+        return _matcher
+
+
+def reextract_all(database: Database, workers: Optional[int] = None) -> Dict[str, float]:
+    """Recompute curriculum_skills for every completed curriculum"""
+    started = time.perf_counter()
+    matcher = get_skill_matcher(database)
+    modules = database.get_curriculum_module_texts()
+    curriculum_of = {module_id: curriculum_id for curriculum_id, module_id, _ in modules}
+
+    matches = extract_batch([(module_id, text) for _, module_id, text in modules], matcher, workers=workers)
+    by_curriculum: Dict[str, List[SkillMatch]] = {curriculum_id: [] for curriculum_id in curriculum_of.values()}
+    for match in matches:
+        by_curriculum[curriculum_of[match[0]]].append(match)
+    for curriculum_id, curriculum_matches in by_curriculum.items():
+        database.save_curriculum_skills(curriculum_id, curriculum_matches)
+
+    elapsed = time.perf_counter() - started
+    return {
+        "curricula": len(by_curriculum),
+        "modules": len(modules),
+        "matches": len(matches),
+        "elapsedSeconds": round(elapsed, 3),
+        "modulesPerSecond": round(len(modules) / elapsed, 1) if elapsed > 0 else 0.0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-extract skills from all completed curricula")
+    parser.add_argument("--db", default="skillbridge.db", help="SQLite database path")
+    parser.add_argument("--workers", type=int, default=None, help="Processes for large batches (default: CPU count)")
+    args = parser.parse_args()
+
+    print("🔎 Extracting skills from curricula...")
+    result = reextract_all(Database(args.db), workers=args.workers)
+    print(
+        f"✅ Done: {result['modules']} modules in {result['curricula']} curricula, "
+        f"{result['matches']} skill matches in {result['elapsedSeconds']}s ({result['modulesPerSecond']} modules/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 """
 Quick test script for API
 """
+import os
+
 import requests
 import json
 
@@ -24,9 +26,15 @@ def test_api():
     if courses:
         print(f"   First course: {courses[0]['title']}\n")
     
+    # Test login
+    print("3. Testing login...")
+    response = requests.post(f"{BASE_URL}/api/auth/login", json={"email": "student@iitu.kz", "password": os.environ.get("SKILLBRIDGE_SAMPLE_PASSWORD", "")})
+    print(f"   Status: {response.status_code}\n")
+    token = response.json().get("token", "")
+    
     # Test get user
-    print("3. Testing get current user...")
-    response = requests.get(f"{BASE_URL}/api/users/me")
+    print("4. Testing get current user...")
+    response = requests.get(f"{BASE_URL}/api/users/me", headers={"Authorization": f"Bearer {token}"})
     print(f"   Status: {response.status_code}")
     if response.status_code == 200:
         user = response.json()
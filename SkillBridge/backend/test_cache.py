@@ -0,0 +1,81 @@
+"""
+TTLCache checks: loads racing invalidations never store stale values, and
+Database entries follow writes made by other processes
+
+Run with: python -m pytest test_cache.py
+"""
+import json
+import os
+import tempfile
+
+from cache import TTLCache, estimate_size
+from database import Database
+
+
+def test_load_invalidated_while_running_is_not_stored():
+    cache = TTLCache()
+
+    def loader():
+        # A write commits and invalidates while this read is still running
+        cache.invalidate(("gap_report", "u1"))
+        return {"version": "old"}
+
+    assert cache.get_or_load(("gap_report", "u1"), loader) == {"version": "old"}
+    assert cache.get(("gap_report", "u1")) is None
+    assert cache.stats()["stale_loads"] == 1
+    assert cache.get_or_load(("gap_report", "u1"), lambda: {"version": "new"}) == {"version": "new"}
+    assert cache.get(("gap_report", "u1")) == {"version": "new"}
+
+
+def test_prefix_invalidation_during_load_skips_the_store():
+    cache = TTLCache()
+
+    def loader():
+        cache.invalidate_prefix(("courses",))
+        return ["old catalog"]
+
+    cache.get_or_load(("courses", "payloads", ()), loader)
+    assert cache.get(("courses", "payloads", ())) is None
+
+
+def test_unrelated_invalidation_does_not_skip_the_store():
+    cache = TTLCache()
+
+    def loader():
+        cache.invalidate(("gap_report", "other"))
+        cache.invalidate_prefix(("roadmap",))
+        return "value"
+
+    cache.get_or_load(("gap_report", "u1"), loader)
+    assert cache.get(("gap_report", "u1")) == "value"
+
+
+def test_size_estimate_samples_long_lists():
+    rows = [{"id": f"course-{number:05d}", "title": "Swift", "skills": ["Swift", "iOS"]} for number in range(10000)]
+    encoded = len(json.dumps(rows))
+    assert abs(estimate_size(rows) - encoded) < encoded * 0.1
+
+
+def test_values_larger_than_max_bytes_are_not_cached():
+    cache = TTLCache(max_bytes=1024)
+    assert cache.get_or_load("big", lambda: "x" * 4096) == "x" * 4096
+    assert cache.get("big") is None
+
+
+def course(title: str) -> dict:
+    return {"id": "c1", "title": title, "provider": "Acme", "description": "", "duration_weeks": 4,
+            "price": 0.0, "level": "Beginner", "skills": [], "url": None, "rating": None}
+
+
+def test_database_reloads_entries_written_by_another_process():
+    path = os.path.join(tempfile.mkdtemp(), "cache.db")
+    server, cli = Database(path), Database(path)
+    server.upsert_courses([course("Swift")])
+    assert server.get_course_by_id("c1")["title"] == "Swift"
+
+    # Another Database on the same file (a second worker, a CLI) writes; this cache is never invalidated
+    cli.upsert_courses([course("SwiftUI")])
+    assert server.get_course_by_id("c1")["title"] == "SwiftUI"
+    (items, _), version, _ = server.get_courses_page_versioned(None, fields=["id", "title"])
+    assert {"id": "c1", "title": "SwiftUI"} in items
+    assert version == server.get_entity_version("courses")[0]
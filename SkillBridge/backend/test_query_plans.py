@@ -0,0 +1,91 @@
+"""
+Query plan checks: hot queries must use an index, never a full scan or sort
+
+Run with: python -m pytest test_query_plans.py  (or python test_query_plans.py)
+"""
+import os
+import tempfile
+
+from database import Database
+
+# (name, SQL, parameters) for every query on a request path
+HOT_QUERIES = [
+    ("user by id", "SELECT * FROM users WHERE id = ?", ("u",)),
+    ("user by email", "SELECT * FROM users WHERE email = ?", ("a@b.c",)),
+    ("course by id", "SELECT * FROM courses WHERE id = ?", ("c",)),
+    ("course page", "SELECT c.id, c.title FROM courses c WHERE c.id > ? ORDER BY c.id LIMIT ?", ("c", 20)),
+    ("courses by skill", '''
+        SELECT c.* FROM courses c WHERE c.id IN (
+            SELECT cs.course_id FROM skills s
+            JOIN course_skills cs ON cs.skill_id = s.id
+            WHERE s.name IN (?)
+            GROUP BY cs.course_id
+        )
+    ''', ("Swift",)),
+    ("latest gap report",
+     "SELECT * FROM gap_reports WHERE user_id = ? ORDER BY generated_at DESC, rowid DESC LIMIT 1", ("u",)),
+    ("latest roadmap",
+     "SELECT * FROM roadmaps WHERE user_id = ? ORDER BY created_at DESC, rowid DESC LIMIT 1", ("u",)),
+    ("roadmap steps", "SELECT * FROM roadmap_steps WHERE roadmap_id = ? ORDER BY step_order", ("r",)),
+    ("update roadmap step", '''
+        UPDATE roadmap_steps SET status = ?, version = version + 1
+        WHERE roadmap_id = ? AND id = ? AND (? IS NULL OR version = ?)
+    ''', ("Completed", "r", "s", None, None)),
+    ("entity version", "SELECT version, updated_at FROM entity_versions WHERE key = ?", ("courses",)),
+    ("user skills", '''
+        SELECT s.name, us.level FROM user_skills us
+        JOIN skills s ON s.id = us.skill_id
+        WHERE us.user_id = ?
+    ''', ("u",)),
+    ("role requirements", '''
+        SELECT s.name, rs.required_level, rs.weight FROM role_skills rs
+        JOIN skills s ON s.id = rs.skill_id
+        WHERE rs.role = ?
+    ''', ("iOS Developer",)),
+    ("curricula by skill", '''
+        SELECT c.id, c.title, SUM(cs.mentions) AS mentions
+        FROM skills s
+        JOIN curriculum_skills cs ON cs.skill_id = s.id
+        JOIN curricula c ON c.id = cs.curriculum_id
+        WHERE s.name = ?
+        GROUP BY cs.curriculum_id
+    ''', ("Swift",)),
+]
+
+
+def make_database() -> Database:
+    # No ANALYZE: with only sample rows, statistics would make scans look cheap
+    return Database(os.path.join(tempfile.mkdtemp(), "plans.db"))
+
+
+def query_plan(database: Database, sql: str, params: tuple) -> list:
+    with database.read_pool.connection() as conn:
+        return [row["detail"] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+def test_migrations_are_recorded_and_idempotent():
+    database = make_database()
+    version = database.get_schema_version()
+    assert version > 0
+    assert database.apply_migrations() == []
+    assert database.get_schema_version() == version
+
+
+def test_hot_queries_use_indexes():
+    database = make_database()
+    for name, sql, params in HOT_QUERIES:
+        plan = query_plan(database, sql, params)
+        scans = [step for step in plan if step.startswith("SCAN ") and "INDEX" not in step]
+        sorts = [step for step in plan if "TEMP B-TREE" in step]
+        assert not scans, f"{name} scans a table: {plan}"
+        assert not sorts, f"{name} sorts in a temp b-tree: {plan}"
+
+
+if __name__ == "__main__":
+    print("🧪 Checking query plans...\n")
+    db_under_test = make_database()
+    for name, sql, params in HOT_QUERIES:
+        print(f"   {name}: {' | '.join(query_plan(db_under_test, sql, params))}")
+    test_migrations_are_recorded_and_idempotent()
+    test_hot_queries_use_indexes()
+    print("\n✅ All hot queries use indexes")
@@ -0,0 +1,68 @@
+"""
+Roadmap generator checks: prerequisite ordering and the shared plan cache
+
+Run with: python -m pytest test_roadmap_generator.py
+"""
+from recommendations import CourseIndex
+from roadmap_generator import RoadmapGenerator, SkillGraph
+
+ROLE = "Backend Developer"
+
+
+def gap(skill: str, current: float, required: float = 80.0, priority: str = "High") -> dict:
+    return {"skillName": skill, "currentLevel": current, "requiredLevel": required, "priority": priority}
+
+
+def make_generator(courses=()) -> RoadmapGenerator:
+    index = CourseIndex()
+    index.load(courses)
+    graph = SkillGraph({"Docker": ["Linux"], "Kubernetes": ["Docker"], "Linux": []})
+    return RoadmapGenerator(graph, index)
+
+
+def test_prerequisites_come_first_even_through_skills_without_a_gap():
+    graph = SkillGraph({"Docker": ["Linux"], "Kubernetes": ["Docker"]})
+    rank = {"Kubernetes": (0,), "Linux": (1,)}
+    # Docker has no gap, but Kubernetes still needs Linux before it
+    assert graph.order(["Kubernetes", "Linux"], rank) == ["Linux", "Kubernetes"]
+
+
+def test_ready_skills_follow_rank_and_cycles_are_kept():
+    graph = SkillGraph({"A": ["B"], "B": ["A"]})
+    rank = {"A": (1,), "B": (0,), "C": (2,)}
+    assert graph.order(["A", "B", "C"], rank) == ["C", "B", "A"]
+
+
+def test_users_sharing_a_plan_get_their_own_step_text():
+    generator = make_generator()
+    first, _ = generator.generate(ROLE, [gap("Kotlin", 40), gap("Rust", 35)])
+    second, _ = generator.generate(ROLE, [gap("Kotlin", 60), gap("Rust", 66)])
+
+    assert generator.stats()["hits"] == 1
+    assert [step["description"] for step in first] == ["Raise Kotlin from 40 to 80", "Raise Rust from 35 to 80"]
+    assert [step["description"] for step in second] == ["Raise Kotlin from 60 to 80", "Raise Rust from 66 to 80"]
+    assert {step["id"] for step in first}.isdisjoint(step["id"] for step in second)
+
+
+def test_step_order_follows_each_users_level_band():
+    generator = make_generator()
+    first, _ = generator.generate(ROLE, [gap("Kotlin", 40), gap("Rust", 10)])
+    second, _ = generator.generate(ROLE, [gap("Kotlin", 10), gap("Rust", 40)])
+
+    assert generator.stats()["misses"] == 2
+    assert [step["skillName"] for step in first] == ["Rust", "Kotlin"]
+    assert [step["skillName"] for step in second] == ["Kotlin", "Rust"]
+
+
+def test_course_steps_use_the_course_and_invalidate_drops_plans():
+    course = {"id": "c1", "title": "Docker Basics", "provider": "Acme", "level": "Beginner", "duration_weeks": 4, "skills": ["Docker"]}
+    generator = make_generator([course])
+    steps, total_hours = generator.generate(ROLE, [gap("Docker", 10), gap("Linux", 50, priority="Low")])
+
+    assert [step["skillName"] for step in steps] == ["Linux", "Docker"]
+    assert steps[1]["courseId"] == "c1"
+    assert steps[1]["description"] == 'Take "Docker Basics" (Acme)'
+    assert total_hours == 10 + 4 * 5
+
+    generator.invalidate()
+    assert generator.stats()["cached"] == 0
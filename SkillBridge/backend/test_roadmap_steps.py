@@ -0,0 +1,51 @@
+"""
+Roadmap step updates: optimistic versions and 409 on stale writes
+
+Run with: python -m pytest test_roadmap_steps.py
+"""
+import os
+import tempfile
+
+import pytest
+from fastapi.testclient import TestClient
+
+from database import Database, VersionConflictError
+from main_with_db import app
+
+
+def make_roadmap(database: Database) -> dict:
+    user = database.create_user(email="steps@example.com", name="Steps")
+    return database.create_roadmap(
+        user_id=user["id"],
+        title="Roadmap",
+        status="Active",
+        estimated_total_hours=10,
+        steps=[{"id": "s1", "title": "Learn Swift", "estHours": 10}]
+    )
+
+
+def test_step_version_advances_and_stale_update_conflicts():
+    database = Database(os.path.join(tempfile.mkdtemp(), "steps.db"))
+    roadmap = make_roadmap(database)
+    assert roadmap["steps"][0]["version"] == 1
+
+    updated = database.update_roadmap_step(roadmap["id"], "s1", "InProgress", expected_version=1)
+    assert updated["steps"][0]["status"] == "InProgress"
+    assert updated["steps"][0]["version"] == 2
+
+    with pytest.raises(VersionConflictError) as conflict:
+        database.update_roadmap_step(roadmap["id"], "s1", "Completed", expected_version=1)
+    assert conflict.value.current_version == 2
+    assert database.get_roadmap_by_id(roadmap["id"])["steps"][0]["status"] == "InProgress"
+
+    # Without a version the update always applies
+    assert database.update_roadmap_step(roadmap["id"], "s1", "Completed")["steps"][0]["version"] == 3
+    assert database.update_roadmap_step(roadmap["id"], "missing", "Completed") is None
+
+
+@pytest.mark.parametrize("version", ["abc", "1", 1.5, True, [1]])
+def test_non_integer_version_is_rejected(version):
+    client = TestClient(app)
+    response = client.put("/api/roadmaps/r/steps/s", json={"status": "Completed", "version": version})
+    assert response.status_code == 400
+    assert response.json() == {"detail": "version must be an integer"}
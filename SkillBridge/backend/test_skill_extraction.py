@@ -0,0 +1,73 @@
+"""
+Skill matcher checks: word boundaries, aliases, longest match and batches
+
+Run with: python -m pytest test_skill_extraction.py
+"""
+import re
+
+import skill_extraction
+from skill_extraction import SkillMatcher
+
+VOCABULARY = {
+    "Swift": [],
+    "SwiftUI": ["Swift UI"],
+    "Git": ["GitHub", "version control"],
+    "C": [],
+    "C++": [],
+    "iOS": ["UIKit"],
+}
+
+
+def naive_count(vocabulary: dict, text: str) -> dict:
+    """Reference: longest term wins at each position, matches must sit on word boundaries"""
+    terms = sorted(
+        ((term.lower(), skill) for skill, aliases in vocabulary.items() for term in (skill, *aliases)),
+        key=lambda item: -len(item[0])
+    )
+    text = text.lower()
+    counts = {}
+    position = 0
+    while position < len(text):
+        for term, skill in terms:
+            end = position + len(term)
+            if (text.startswith(term, position)
+                    and (position == 0 or not text[position - 1].isalnum())
+                    and (end == len(text) or not text[end].isalnum())):
+                counts[skill] = counts.get(skill, 0) + 1
+                position = end
+                break
+        else:
+            position += 1
+    return counts
+
+
+def test_matches_respect_word_boundaries():
+    matcher = SkillMatcher(VOCABULARY)
+    assert matcher.count("Digital swiftly legit") == {}
+    assert matcher.count("Swift, git and C.") == {"Swift": 1, "Git": 1, "C": 1}
+
+
+def test_aliases_map_to_their_skill_case_insensitively():
+    matcher = SkillMatcher(VOCABULARY)
+    assert matcher.count("Push to GITHUB, use Version Control, build UIKit screens") == {"Git": 2, "iOS": 1}
+
+
+def test_overlapping_terms_keep_the_longest():
+    matcher = SkillMatcher(VOCABULARY)
+    assert matcher.find("SwiftUI") == [(0, 7, "SwiftUI")]
+    assert matcher.count("Swift UI views in Swift") == {"SwiftUI": 1, "Swift": 1}
+    assert matcher.count("C++ before C") == {"C++": 1, "C": 1}
+
+
+def test_matcher_agrees_with_a_naive_scan():
+    matcher = SkillMatcher(VOCABULARY)
+    text = "Module 1: Swift basics. Git, GitHub and version control. SwiftUI vs Swift UI vs UIKit on iOS; C and C++."
+    assert matcher.count(text) == naive_count(VOCABULARY, text)
+    for word in re.findall(r"\w+", text):
+        assert matcher.count(word) == naive_count(VOCABULARY, word)
+
+
+def test_extract_batch_reports_mentions_per_module():
+    matcher = SkillMatcher(VOCABULARY)
+    modules = [("m1", "Swift and more Swift"), ("m2", "Nothing here"), ("m3", "GitHub")]
+    assert sorted(skill_extraction.extract_batch(modules, matcher)) == [("m1", "Swift", 2), ("m3", "Git", 1)]